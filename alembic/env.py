@@ -20,6 +20,11 @@ from app.db.models.student_model import Student
 from app.db.models.content_model import Content
 from app.db.models.grade_model import Grade
 from app.db.models.attendance_model import Attendance
+from app.db.models.rate_limit_model import RateLimitCounter
+from app.db.models.attendance_year_model import AttendanceYear
+from app.db.models.revoked_token_model import RevokedToken
+from app.db.models.teacher_weekly_summary_model import TeacherWeeklySummary
+from app.db.models.upload_model import Upload
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,28 @@
+"""add_grades_student_index
+
+Revision ID: 0b7d3e5f9a12
+Revises: f2a6c9d81b37
+Create Date: 2026-10-19 16:48:05.331967
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7d3e5f9a12'
+down_revision: Union[str, None] = 'f2a6c9d81b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_grades_student_id_grading_date', 'grades', ['student_id', 'grading_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_grades_student_id_grading_date', table_name='grades')
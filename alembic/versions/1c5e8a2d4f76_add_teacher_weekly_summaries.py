@@ -0,0 +1,39 @@
+"""add_teacher_weekly_summaries
+
+Revision ID: 1c5e8a2d4f76
+Revises: 0b7d3e5f9a12
+Create Date: 2026-10-19 17:22:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c5e8a2d4f76'
+down_revision: Union[str, None] = '0b7d3e5f9a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('teacher_weekly_summaries',
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('report_xlsx', sa.LargeBinary(), nullable=True),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('teacher_id', 'week_start')
+    )
+    op.create_index(op.f('ix_teacher_weekly_summaries_computed_at'), 'teacher_weekly_summaries', ['computed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_teacher_weekly_summaries_computed_at'), table_name='teacher_weekly_summaries')
+    op.drop_table('teacher_weekly_summaries')
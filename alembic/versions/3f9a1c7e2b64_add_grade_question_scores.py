@@ -0,0 +1,34 @@
+"""add_grade_question_scores
+
+Revision ID: 3f9a1c7e2b64
+Revises: xxxx
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e2b64'
+down_revision: Union[str, None] = 'xxxx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('grades', sa.Column('question_scores', postgresql.ARRAY(sa.Float()), nullable=True))
+    op.add_column('grades', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    # Analytics load every grade of one exam/quiz at a time
+    op.create_index(op.f('ix_grades_content_id'), 'grades', ['content_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_grades_content_id'), table_name='grades')
+    op.drop_column('grades', 'updated_at')
+    op.drop_column('grades', 'question_scores')
@@ -0,0 +1,46 @@
+"""add_uploads
+
+Revision ID: 5d2b7f4e9c31
+Revises: 1c5e8a2d4f76
+Create Date: 2026-10-19 18:04:13.270546
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b7f4e9c31'
+down_revision: Union[str, None] = '1c5e8a2d4f76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('uploads',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('mime_type', sa.String(length=100), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('purpose', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('teacher_id', 'sha256', name='uq_uploads_teacher_id_sha256')
+    )
+    op.create_index(op.f('ix_uploads_id'), 'uploads', ['id'], unique=False)
+    op.create_index(op.f('ix_uploads_sha256'), 'uploads', ['sha256'], unique=False)
+    op.create_index(op.f('ix_uploads_teacher_id'), 'uploads', ['teacher_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_uploads_teacher_id'), table_name='uploads')
+    op.drop_index(op.f('ix_uploads_sha256'), table_name='uploads')
+    op.drop_index(op.f('ix_uploads_id'), table_name='uploads')
+    op.drop_table('uploads')
@@ -0,0 +1,52 @@
+"""content_jsonb_and_gin_indexes
+
+Revision ID: 8c2d4e6f1a93
+Revises: 3f9a1c7e2b64
+Create Date: 2026-10-19 10:03:17.542981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2d4e6f1a93'
+down_revision: Union[str, None] = '3f9a1c7e2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('content', 'data',
+                    existing_type=sa.JSON(),
+                    type_=postgresql.JSONB(),
+                    existing_nullable=True,
+                    postgresql_using='data::jsonb')
+    op.alter_column('content', 'answer_key',
+                    existing_type=sa.JSON(),
+                    type_=postgresql.JSONB(),
+                    existing_nullable=True,
+                    postgresql_using='answer_key::jsonb')
+    op.create_index('ix_content_teacher_id_created_at', 'content', ['teacher_id', 'created_at'], unique=False)
+    op.create_index('ix_content_data_gin', 'content', ['data'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_content_data_gin', table_name='content')
+    op.drop_index('ix_content_teacher_id_created_at', table_name='content')
+    op.alter_column('content', 'answer_key',
+                    existing_type=postgresql.JSONB(),
+                    type_=sa.JSON(),
+                    existing_nullable=True,
+                    postgresql_using='answer_key::json')
+    op.alter_column('content', 'data',
+                    existing_type=postgresql.JSONB(),
+                    type_=sa.JSON(),
+                    existing_nullable=True,
+                    postgresql_using='data::json')
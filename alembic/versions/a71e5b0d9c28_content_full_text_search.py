@@ -0,0 +1,45 @@
+"""content_full_text_search
+
+Revision ID: a71e5b0d9c28
+Revises: 8c2d4e6f1a93
+Create Date: 2026-10-19 11:26:52.307114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71e5b0d9c28'
+down_revision: Union[str, None] = '8c2d4e6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.db.models.content_model.SEARCH_VECTOR_EXPRESSION
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('simple', coalesce(data, '{}'::jsonb), '[\"string\"]'), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a STORED generated column rewrites the table once and fills existing rows
+    op.add_column('content', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_content_search_vector', 'content', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_content_search_vector', table_name='content')
+    op.drop_column('content', 'search_vector')
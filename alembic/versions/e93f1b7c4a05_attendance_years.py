@@ -0,0 +1,139 @@
+"""attendance_years
+
+Revision ID: e93f1b7c4a05
+Revises: c4b8e2a6d150
+Create Date: 2026-10-19 15:12:47.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93f1b7c4a05'
+down_revision: Union[str, None] = 'c4b8e2a6d150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with YEAR_START_MONTH and STATUS_CODES in app.db.models.attendance_year_model
+# Executed one statement at a time (some drivers reject multi-statement strings)
+CREATE_FUNCTIONS = (
+    r"""
+CREATE FUNCTION attendance_year_start(d date) RETURNS date
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT make_date(CASE WHEN extract(month FROM d) >= 9 THEN extract(year FROM d)::int
+                          ELSE extract(year FROM d)::int - 1 END, 9, 1)
+$$
+""",
+    r"""
+CREATE FUNCTION attendance_status_code(status text) RETURNS integer
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE status WHEN 'PRESENT' THEN 1 WHEN 'ABSENT' THEN 2
+                       WHEN 'LATE' THEN 3 WHEN 'EXCUSED' THEN 4 ELSE 0 END
+$$
+""",
+    r"""
+-- Rewrite one day's byte from the latest remaining attendance record of that day
+CREATE FUNCTION attendance_years_refresh_day(p_student integer, p_date date) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_year date := attendance_year_start(p_date);
+    v_offset integer := p_date - attendance_year_start(p_date);
+    v_code integer;
+BEGIN
+    SELECT attendance_status_code(status::text) INTO v_code
+    FROM attendance
+    WHERE student_id = p_student AND attendance_date = p_date
+    ORDER BY id DESC
+    LIMIT 1;
+
+    INSERT INTO attendance_years (student_id, year_start, codes)
+    VALUES (p_student, v_year, ''::bytea)
+    ON CONFLICT (student_id, year_start) DO NOTHING;
+
+    UPDATE attendance_years
+    SET codes = set_byte(
+            CASE WHEN length(codes) > v_offset THEN codes
+                 ELSE codes || decode(repeat('00', v_offset + 1 - length(codes)), 'hex') END,
+            v_offset, coalesce(v_code, 0)),
+        updated_at = now()
+    WHERE student_id = p_student AND year_start = v_year;
+END
+$$
+""",
+    r"""
+CREATE FUNCTION attendance_years_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM attendance_years_refresh_day(OLD.student_id, OLD.attendance_date);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM attendance_years_refresh_day(NEW.student_id, NEW.attendance_date);
+    END IF;
+    RETURN NULL;
+END
+$$
+""",
+    r"""
+CREATE TRIGGER attendance_years_sync
+AFTER INSERT OR UPDATE OF student_id, attendance_date, status OR DELETE ON attendance
+FOR EACH ROW EXECUTE FUNCTION attendance_years_sync()
+""",
+)
+
+# One bytea per (student, year) from existing records, days without a record as 0x00
+BACKFILL = r"""
+WITH latest AS (
+    SELECT DISTINCT ON (student_id, attendance_date) student_id, attendance_date, status
+    FROM attendance
+    ORDER BY student_id, attendance_date, id DESC
+), placed AS (
+    SELECT student_id,
+           attendance_year_start(attendance_date) AS year_start,
+           attendance_date - attendance_year_start(attendance_date) AS day_offset,
+           attendance_status_code(status::text) AS code
+    FROM latest
+), years AS (
+    SELECT student_id, year_start, max(day_offset) AS last_offset
+    FROM placed
+    GROUP BY student_id, year_start
+)
+INSERT INTO attendance_years (student_id, year_start, codes)
+SELECT y.student_id, y.year_start,
+       decode(string_agg(lpad(to_hex(coalesce(p.code, 0)), 2, '0'), '' ORDER BY g.day_offset), 'hex')
+FROM years y
+CROSS JOIN LATERAL generate_series(0, y.last_offset) AS g(day_offset)
+LEFT JOIN placed p
+       ON p.student_id = y.student_id AND p.year_start = y.year_start AND p.day_offset = g.day_offset
+GROUP BY y.student_id, y.year_start
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_attendance_student_id_attendance_date', 'attendance', ['student_id', 'attendance_date'], unique=False)
+    op.create_table('attendance_years',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('year_start', sa.Date(), nullable=False),
+    sa.Column('codes', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('student_id', 'year_start')
+    )
+    for statement in CREATE_FUNCTIONS:
+        op.execute(statement)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS attendance_years_sync ON attendance")
+    op.execute("DROP FUNCTION IF EXISTS attendance_years_sync()")
+    op.execute("DROP FUNCTION IF EXISTS attendance_years_refresh_day(integer, date)")
+    op.execute("DROP FUNCTION IF EXISTS attendance_status_code(text)")
+    op.execute("DROP FUNCTION IF EXISTS attendance_year_start(date)")
+    op.drop_table('attendance_years')
+    op.drop_index('ix_attendance_student_id_attendance_date', table_name='attendance')
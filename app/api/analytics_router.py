@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.responses import ORJSONResponse
+from app.schemas import analytics_schema
+from app.services import analytics_service
+from app.db.models.user_model import User
+
+router = APIRouter()
+
+@router.get("/content/{content_id}", response_model=analytics_schema.ContentAnalytics)
+async def read_content_analytics(
+    content_id: int,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Get item analysis (difficulty, discrimination) and class statistics
+    (percentiles, histogram, per-student z-scores) for an exam or quiz.
+    """
+    analytics = await analytics_service.get_content_analytics(
+        db=db, content_id=content_id, teacher_id=current_user.id
+    )
+    return ORJSONResponse(analytics) # Serialized directly by pydantic-core
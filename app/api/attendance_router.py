@@ -0,0 +1,34 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.responses import ORJSONResponse
+from app.db.models.attendance_year_model import academic_year_start
+from app.db.models.user_model import User
+from app.schemas import attendance_schema
+from app.services import attendance_service
+
+router = APIRouter()
+
+@router.get("/summary", response_model=attendance_schema.ClassAttendanceSummary)
+async def read_class_attendance_summary(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    grade_level: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Attendance rates, longest absence streaks and weekday absence patterns for the
+    current teacher's students. Defaults to the academic year so far; the range must
+    lie within one academic year (starting September 1st).
+    """
+    end_date = end_date or date.today()
+    start_date = start_date or academic_year_start(end_date)
+    summary = await attendance_service.get_class_attendance_summary(
+        db, teacher_id=current_user.id, start_date=start_date, end_date=end_date, grade_level=grade_level
+    )
+    return ORJSONResponse(summary) # Serialized directly by pydantic-core
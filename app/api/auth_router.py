@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Security
 from fastapi.security import OAuth2PasswordRequestForm # For form data login
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,12 +8,19 @@ from app.api import deps
 from app.schemas import user_schema, token_schema
 from app.services import auth_service
 from app.core import security
+from app.core.responses import schema_response
+from app.core.rate_limit import limit_by_ip, enforce_setting
+from app.core.revocation import revocation_list
 from app.db.models.user_model import User
 from app.core.config import settings # For cookie settings
 
 router = APIRouter()
 
-@router.post("/register", response_model=user_schema.UserRead)
+@router.post(
+    "/register",
+    response_model=user_schema.UserRead,
+    dependencies=[Depends(limit_by_ip("register", "RATE_LIMIT_REGISTER_PER_IP"))],
+)
 async def register_user(
     user_in: user_schema.UserCreate,
     db: AsyncSession = Depends(deps.get_db)
@@ -28,9 +37,12 @@ async def register_user(
         )
     return user
 
-@router.post("/login") # No response_model here as token is in cookie
+@router.post(
+    "/login",
+    response_model=user_schema.UserRead, # Token goes in the cookie, user in the body
+    dependencies=[Depends(limit_by_ip("login", "RATE_LIMIT_LOGIN_PER_IP"))],
+)
 async def login_for_access_token(
-    response: Response, # To set the cookie
     db: AsyncSession = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends() # Using form data for login
 ):
@@ -38,6 +50,8 @@ async def login_for_access_token(
     Log in a user and set an HttpOnly access token cookie.
     Returns user details in the response body.
     """
+    # Per-account limit against distributed credential stuffing; checked before bcrypt runs
+    await enforce_setting(f"login:email:{form_data.username.lower()}", "RATE_LIMIT_LOGIN_PER_EMAIL")
     user = await auth_service.authenticate_user(
         db=db, email=form_data.username, password=form_data.password
     )
@@ -52,6 +66,8 @@ async def login_for_access_token(
         subject=str(user.id) # Ensure subject is a string for JWT
     )
     
+    # Return user info in body as per plan; the cookie is set on this response object
+    response = schema_response(user_schema.UserRead, user)
     response.set_cookie(
         key="access_token",
         value=access_token,
@@ -61,15 +77,22 @@ async def login_for_access_token(
         secure=True if settings.API_V1_STR.startswith("https") else False, # Set Secure flag in production
         path="/" # Cookie available for all paths
     )
-    # Return user info in body as per plan
-    return user_schema.UserRead.from_orm(user)
+    return response
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(
+    response: Response,
+    token: Optional[str] = Security(deps.oauth2_scheme_cookie),
+    db: AsyncSession = Depends(deps.get_db)
+):
     """
-    Log out a user by clearing the access token cookie.
+    Log out a user by revoking the access token and clearing its cookie.
     """
+    token_data = security.decode_access_token(token) if token else None
+    if token_data and token_data.jti and token_data.expires_at:
+        # A copy of the cookie stays unusable until it expires
+        await revocation_list.revoke(db, token_data.jti, token_data.expires_at)
     response.delete_cookie(key="access_token", path="/", httponly=True)
     return {"message": "Successfully logged out"}
 
@@ -80,10 +103,13 @@ async def read_users_me(
     """
     Get current logged-in user.
     """
-    return current_user
+    return schema_response(user_schema.UserRead, current_user)
 # --- Forgot/Reset Password Endpoints ---
 
-@router.post("/forgot-password")
+@router.post(
+    "/forgot-password",
+    dependencies=[Depends(limit_by_ip("forgot-password", "RATE_LIMIT_FORGOT_PASSWORD_PER_IP"))],
+)
 async def request_password_reset(
     request: user_schema.ForgotPasswordRequest,
     db: AsyncSession = Depends(deps.get_db)
@@ -96,7 +122,10 @@ async def request_password_reset(
     result = await auth_service.handle_forgot_password(db=db, email=request.email)
     return result # e.g., {"message": "If an account exists..."}
 
-@router.post("/reset-password")
+@router.post(
+    "/reset-password",
+    dependencies=[Depends(limit_by_ip("reset-password", "RATE_LIMIT_RESET_PASSWORD_PER_IP"))],
+)
 async def reset_password(
     request: user_schema.ResetPasswordRequest,
     db: AsyncSession = Depends(deps.get_db)
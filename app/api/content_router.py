@@ -1 +1,154 @@
- 
\ No newline at end of file
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.responses import ORJSONResponse, schema_response
+from app.schemas import content_schema
+from app.db.crud import crud_content
+from app.services import content_reuse_service, content_search_service, content_service
+from app.db.models.content_model import ContentType
+from app.db.models.user_model import User
+
+router = APIRouter()
+
+@router.get("/", response_model=List[content_schema.ContentSummary])
+async def list_content(
+    content_type: Optional[ContentType] = None,
+    subject: Optional[str] = None,
+    grade_level: Optional[str] = None,
+    min_questions: Optional[int] = Query(None, ge=0),
+    max_questions: Optional[int] = Query(None, ge=0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    List the current teacher's content library (without the data/answer_key payloads).
+    `subject` and `grade_level` match the same-named fields inside `data`.
+    """
+    data_filters = {}
+    if subject is not None:
+        data_filters["subject"] = subject
+    if grade_level is not None:
+        data_filters["grade_level"] = grade_level
+    rows = await crud_content.list_content_for_teacher(
+        db,
+        teacher_id=current_user.id,
+        content_type=content_type,
+        data_filters=data_filters,
+        min_questions=min_questions,
+        max_questions=max_questions,
+        skip=skip,
+        limit=limit,
+    )
+    return schema_response(List[content_schema.ContentSummary], rows)
+
+@router.post("/", response_model=content_schema.ContentRead, status_code=status.HTTP_201_CREATED)
+async def create_content(
+    content_in: content_schema.ContentCreate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Add a content item written by the teacher to their library.
+    """
+    content = await content_service.create_content(db, teacher_id=current_user.id, content_in=content_in)
+    return schema_response(content_schema.ContentRead, content, status_code=status.HTTP_201_CREATED)
+
+@router.post("/generate", response_model=content_schema.ContentGenerationResult, status_code=status.HTTP_201_CREATED)
+async def generate_content(
+    request: content_schema.ContentGenerationRequest,
+    allow_reuse: bool = True,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Generate a content item with Gemini. When the teacher's library (or, with
+    CONTENT_REUSE_SCOPE="all", anyone's) already holds a near-duplicate, that item is
+    returned instead (`reused`); pass `allow_reuse=false` to always generate.
+    """
+    content, reused = await content_service.generate_content(
+        db, teacher_id=current_user.id, request=request, allow_reuse=allow_reuse
+    )
+    return schema_response(
+        content_schema.ContentGenerationResult,
+        {"content": content, "reused": reused},
+        status_code=status.HTTP_201_CREATED,
+    )
+
+@router.get("/search", response_model=content_schema.ContentSearchPage)
+async def search_content(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Full-text search over the current teacher's content (title, description and data).
+    Every term is matched as a prefix, so this also serves search-as-you-type.
+    Results are ranked; pass `next_cursor` back as `cursor` for the next page.
+    """
+    page = await content_search_service.search_teacher_content(
+        db, teacher_id=current_user.id, text=q, limit=limit, cursor=cursor
+    )
+    return ORJSONResponse(page)
+
+@router.post("/similar", response_model=List[content_schema.SimilarContent])
+async def find_similar_content(
+    request: content_schema.ContentGenerationRequest,
+    limit: int = Query(5, ge=1, le=20),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Existing generated content similar to a generation request, most similar first,
+    so the teacher can pick one instead of generating. Empty if the vector store is unavailable.
+    """
+    matches = await content_reuse_service.suggest_similar(
+        db, teacher_id=current_user.id, request=request, limit=limit
+    )
+    return schema_response(List[content_schema.SimilarContent], matches)
+
+@router.get("/reuse-stats", response_model=content_schema.ContentReuseStats)
+async def read_reuse_stats(
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Semantic reuse counters of this worker: lookups, reused vs generated items and the
+    share of generation (LLM) calls avoided.
+    """
+    return ORJSONResponse(content_reuse_service.get_reuse_stats())
+
+@router.get("/{content_id}", response_model=content_schema.ContentRead)
+async def read_content(
+    content_id: int,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Get a single content item including its data and answer key.
+    """
+    content = await crud_content.get_content_by_id(
+        db, content_id=content_id, teacher_id=current_user.id, with_data=True, with_answer_key=True
+    )
+    if not content:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
+    return schema_response(content_schema.ContentRead, content)
+
+@router.patch("/{content_id}", response_model=content_schema.ContentRead)
+async def update_content(
+    content_id: int,
+    content_in: content_schema.ContentUpdate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Change fields of one of the teacher's content items.
+    """
+    content = await content_service.update_content(
+        db, teacher_id=current_user.id, content_id=content_id, content_in=content_in
+    )
+    return schema_response(content_schema.ContentRead, content)
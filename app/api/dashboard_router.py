@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.responses import ORJSONResponse
+from app.db.models.user_model import User
+from app.schemas import dashboard_schema
+from app.services import dashboard_service
+
+router = APIRouter()
+
+@router.get("/", response_model=dashboard_schema.TeacherDashboard)
+async def read_teacher_dashboard(
+    recent_grades: int = Query(3, ge=1, le=20),
+    grade_level: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Get the current teacher's class overview: per student the most recent grades,
+    average score and attendance rate for the academic year.
+    """
+    dashboard = await dashboard_service.get_teacher_dashboard(
+        db, teacher_id=current_user.id, recent_grades=recent_grades, grade_level=grade_level
+    )
+    return ORJSONResponse(dashboard) # Serialized directly by pydantic-core
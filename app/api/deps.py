@@ -4,7 +4,9 @@ from fastapi.security import APIKeyCookie
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db # Using the one from database.py
+from app.db.replicas import get_read_db # Read-only routes: replica when available
 from app.core import security
+from app.core.revocation import revocation_list
 from app.schemas.token_schema import TokenData
 from app.db.models.user_model import User
 from app.db.crud import crud_user
@@ -34,6 +36,10 @@ async def get_current_user(
         # )
         return None # Or handle as unauthenticated
 
+    # In-memory check (Bloom filter + exact set); tokens issued before jti existed carry none
+    if token_data.jti and await revocation_list.is_revoked(token_data.jti):
+        return None # Logged out
+
     user = await crud_user.get_user_by_id(db, user_id=token_data.user_id)
     if not user:
         # This case means token is valid but user doesn't exist, which is unusual
@@ -0,0 +1,52 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.responses import ORJSONResponse
+from app.db.models.user_model import User
+from app.schemas import weekly_summary_schema
+from app.services import weekly_summary_service
+
+router = APIRouter()
+
+def _week(week_of: Optional[date]) -> date:
+    return weekly_summary_service.week_start_of(week_of) if week_of else weekly_summary_service.last_complete_week()
+
+@router.get("/weekly", response_model=weekly_summary_schema.TeacherWeeklySummary)
+async def read_weekly_summary(
+    week_of: Optional[date] = None,
+    refresh: bool = False,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Get the current teacher's grade and attendance summary for the week (Monday to Sunday)
+    containing `week_of`, by default the last complete week. Complete weeks are precomputed
+    off-peak and served while they still match the grades and attendance (late entries
+    trigger a recomputation); `refresh=true` always recomputes.
+    """
+    summary = await weekly_summary_service.get_weekly_summary(
+        db, teacher_id=current_user.id, week_start=_week(week_of), refresh=refresh
+    )
+    return ORJSONResponse(summary) # Serialized directly by pydantic-core
+
+@router.get("/weekly/report", response_class=Response)
+async def download_weekly_report(
+    week_of: Optional[date] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Download the weekly summary as an .xlsx report (prebuilt for complete weeks, rebuilt
+    when grades or attendance changed since).
+    """
+    week_start = _week(week_of)
+    report = await weekly_summary_service.get_weekly_report(db, teacher_id=current_user.id, week_start=week_start)
+    return Response(
+        content=report,
+        media_type=weekly_summary_service.XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="weekly-summary-{week_start.isoformat()}.xlsx"'},
+    )
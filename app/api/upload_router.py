@@ -0,0 +1,68 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.responses import ORJSONResponse, schema_response
+from app.db.crud import crud_upload
+from app.db.models.user_model import User
+from app.schemas import upload_schema
+from app.services import upload_service
+
+router = APIRouter()
+
+@router.post("/", response_model=upload_schema.UploadRead, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Upload an answer-sheet scan or roster file as multipart/form-data: the file in the
+    `file` field, optionally `purpose` ("answer_sheet" or "roster").
+    The body is streamed and hashed on the fly; files above the size limit or the
+    remaining quota are rejected with 413, unsupported types (sniffed from the content)
+    with 415. Uploading the same file again returns the existing upload (200).
+    """
+    # The body is read by the upload pipeline, not by FastAPI (no UploadFile parameter)
+    teacher_id = current_user.id
+    upload, created = await upload_service.handle_upload(request, db, teacher_id=teacher_id)
+    return schema_response(
+        upload_schema.UploadRead, upload, status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+    )
+
+@router.get("/", response_model=List[upload_schema.UploadRead])
+async def list_uploads(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    List the current teacher's uploads, newest first.
+    """
+    uploads = await crud_upload.list_uploads_for_teacher(db, teacher_id=current_user.id, skip=skip, limit=limit)
+    return schema_response(List[upload_schema.UploadRead], uploads)
+
+@router.get("/usage", response_model=upload_schema.UploadUsage)
+async def read_upload_usage(
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Bytes stored by the current teacher and their quota.
+    """
+    return ORJSONResponse(await upload_service.get_usage(db, teacher_id=current_user.id))
+
+@router.get("/{upload_id}", response_model=upload_schema.UploadRead)
+async def read_upload(
+    upload_id: int,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Get an upload's metadata.
+    """
+    upload = await upload_service.get_upload_or_404(db, upload_id=upload_id, teacher_id=current_user.id)
+    return schema_response(upload_schema.UploadRead, upload)
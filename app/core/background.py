@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from typing import Coroutine, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Strong references to fire-and-forget tasks (asyncio only keeps weak ones)
+_tasks: Set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+    """
+    Run a coroutine in the background without awaiting it in the request.
+    The task is tracked so graceful shutdown can wait for it (see drain).
+    """
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+def _on_done(task: asyncio.Task) -> None:
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=task.exception())
+
+
+def pending_count() -> int:
+    return len(_tasks)
+
+
+async def drain(timeout: float) -> None:
+    """
+    Wait up to `timeout` seconds for background tasks to finish, then cancel the rest.
+    Called from the app lifespan on shutdown.
+    """
+    if not _tasks:
+        return
+    logger.info("Waiting for %d background task(s) to finish", len(_tasks))
+    done, pending = await asyncio.wait(set(_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning("Cancelled %d background task(s) still running after %.1fs", len(pending), timeout)
+        await asyncio.gather(*pending, return_exceptions=True)
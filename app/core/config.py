@@ -1,10 +1,10 @@
+from functools import lru_cache
+from pathlib import Path
 from pydantic_settings import BaseSettings
 from typing import Optional
-import os
-from dotenv import load_dotenv
 
-# Load .env file
-load_dotenv()
+# .env in the backend root, independent of the working directory
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
 
 class Settings(BaseSettings):
     # API Information
@@ -13,18 +13,46 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5 # Per worker: total connections = workers * (pool size + overflow)
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_WARM_POOL_ON_STARTUP: bool = True # Open one connection during startup so the first request doesn't pay for it
+    DB_ECHO: bool = False # Log every SQL statement (through the logging pipeline; sample with LOG_SAMPLE_RATES)
+    # Read replicas (see app/db/replicas.py); empty = every query goes to the primary
+    DATABASE_REPLICA_URLS: str = "" # Comma-separated, same driver as DATABASE_URL
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0 # Replicas further behind are skipped
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0 # How long a replica's health/lag result is reused
+    DB_REPLICA_CHECK_TIMEOUT_SECONDS: float = 1.0
+    DB_READ_YOUR_WRITES_SECONDS: int = 10 # After a write, the client's reads stay on the primary this long
     
     # JWT
     JWT_SECRET_KEY: str # Renamed from JWT_SECRET based on error
     ALGORITHM: str = "HS256" # Renamed from JWT_ALGORITHM based on error
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30 # Expiry for password reset tokens
+    # Token revocation (see app/core/revocation.py)
+    REVOCATION_REFRESH_SECONDS: float = 2.0 # How soon a worker sees revocations made by other workers
+    REVOCATION_PURGE_SECONDS: int = 3600 # How often revocations of expired tokens are deleted
+    REVOCATION_BLOOM_FALSE_POSITIVE_RATE: float = 0.001 # Share of checks that need a database lookup
+    REVOCATION_EXACT_SET_MAX: int = 10_000 # Revocations held exactly before the Bloom filter is rebuilt
+    
+    # Rate limiting of auth endpoints ("<hits>/<second|minute|hour|day>" or "<hits>/<N> <seconds|minutes|...>", checked at start-up)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory" # "memory" (per worker) or "postgres" (shared across workers)
+    RATE_LIMIT_MAX_KEYS: int = 100_000 # Bound on in-memory counters (least recently used are evicted)
+    RATE_LIMIT_LOGIN_PER_IP: str = "20/minute"
+    RATE_LIMIT_LOGIN_PER_EMAIL: str = "5/minute"
+    RATE_LIMIT_REGISTER_PER_IP: str = "5/minute"
+    RATE_LIMIT_FORGOT_PASSWORD_PER_IP: str = "5/minute"
+    RATE_LIMIT_RESET_PASSWORD_PER_IP: str = "10/minute"
+    PASSWORD_RESET_COALESCE_SECONDS: int = 300 # Repeat reset requests for an email within this window send no new email
     
     # Frontend URL (for password reset links, etc.)
     FRONTEND_URL: str = "http://localhost:3001"
     
     # Google Gemini API
     GEMINI_API_KEY: Optional[str] = None
+    GEMINI_MODEL: str = "gemini-1.5-flash" # Model used for content generation
     
     # OCR.space API
     OCR_SPACE_API_KEY: Optional[str] = None # Renamed from OCR_API_KEY based on error
@@ -37,11 +65,81 @@ class Settings(BaseSettings):
     EMAIL_FROM_ADDRESS: Optional[str] = None # Added based on error
     
     # ChromaDB
-    CHROMA_DB_PATH: str = ".chromadb"
+    CHROMA_DB_PATH: str = ".chromadb" # Embedded store; opened by one process only (see app/core/vector_store.py)
+    CHROMA_HOST: Optional[str] = None # Chroma server shared by all workers; set whenever WEB_CONCURRENCY > 1
+    CHROMA_PORT: int = 8000
+    GENERATED_CONTENT_COLLECTION: str = "generated_content" # Embeddings of generated content (next to the curriculum)
+    CONTENT_REUSE_ENABLED: bool = True # Look for a near-duplicate before calling Gemini
+    CONTENT_REUSE_SIMILARITY_THRESHOLD: float = 0.92 # Cosine similarity needed to reuse an existing item
+    CONTENT_REUSE_SCOPE: str = "teacher" # "teacher" (own library) or "all" (other teachers' items are copied)
+    CONTENT_REUSE_CANDIDATES: int = 5 # Nearest neighbours fetched per lookup
+    
+    # Uploads (see app/core/uploads.py)
+    UPLOAD_DIR: str = "uploads" # Content-addressed file store
+    UPLOAD_MAX_BYTES: int = 20 * 1024 * 1024 # Per file; larger uploads are cut off with 413
+    UPLOAD_SPOOL_MEMORY_BYTES: int = 1024 * 1024 # Per upload in memory before spooling to a temp file
+    UPLOAD_TEACHER_QUOTA_BYTES: int = 1024 * 1024 * 1024 # Total stored per teacher (re-uploads of the same file are free)
+    UPLOAD_ALLOWED_MIME_TYPES: str = "image/jpeg,image/png,image/tiff,image/webp,application/pdf,text/csv,application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" # Sniffed from content, comma-separated
+    
+    # Production server (see app/server.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: Optional[int] = None # Worker processes; defaults to the available CPU cores
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 20 # Keep above the load balancer's idle timeout
+    SERVER_MAX_REQUESTS: Optional[int] = 10000 # Recycle a worker after this many requests (memory growth)
+    SERVER_MAX_REQUESTS_JITTER: int = 1000 # Spread recycling so workers don't restart together
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30 # Time to drain in-flight requests on shutdown
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = 10.0 # Time for background tasks (e.g. queued emails) on shutdown
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1" # Proxies trusted for X-Forwarded-* headers
+    
+    # Outbound HTTP (shared httpx client)
+    HTTP_CLIENT_TIMEOUT: float = 30.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    
+    # Response compression (gzip/brotli negotiated via Accept-Encoding)
+    COMPRESSION_MINIMUM_SIZE: int = 1024 # Bytes; smaller bodies are sent uncompressed
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4 # 0-11; higher is smaller but slower
+    
+    # Logging (see app/core/logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json" # "json" (one object per line) or "text"
+    LOG_QUEUE_SIZE: int = 10_000 # Records waiting for the writer thread; beyond this they are dropped, never waited on
+    LOG_SAMPLE_RATES: str = "" # Share of records below WARNING kept per logger, e.g. "sqlalchemy.engine=0.01,uvicorn.access=0.1"
+    LOG_RATE_LIMITS: str = "" # Opt-in caps per message template and second, below ERROR, e.g. "app.services=50,httpx=20" (sample uvicorn.access instead)
+    
+    # Background scheduler (see app/core/scheduler.py); times are UTC
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_MISFIRE_GRACE_HOURS: float = 12.0 # A run missed within this window (deploy, restart) is run at start-up
+    WEEKLY_SUMMARY_WEEKDAY: int = 0 # Monday = 0; summarizes the week that just ended
+    WEEKLY_SUMMARY_HOUR: int = 2 # Off-peak, before teachers open their summaries
+    WEEKLY_SUMMARY_CONCURRENCY: int = 4 # Teachers computed at once (each holds a DB connection)
+    WEEKLY_SUMMARY_SPREAD_SECONDS: float = 1800.0 # Teachers start at random offsets within this window
+    
+    # Analytics
+    ANALYTICS_CACHE_SIZE: int = 256 # Number of content items whose analytics are kept in memory
+    ANALYTICS_HISTOGRAM_BINS: int = 10
     
     class Config:
-        env_file = ".env"
+        env_file = ENV_FILE
         case_sensitive = True
 
-# Create settings instance
-settings = Settings() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings from the environment / .env once, on first use."""
+    return Settings()
+
+class _LazySettings:
+    """
+    Stand-in for the Settings instance that loads it on first attribute access,
+    so importing a module that does `from app.core.config import settings` has no side effects.
+    """
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {get_settings()!r}>"
+
+# Settings instance (resolved lazily)
+settings: Settings = _LazySettings() # type: ignore[assignment]
@@ -0,0 +1,30 @@
+from typing import Optional, TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+# Shared client: one connection pool per worker for outbound calls (Gemini, OCR.space, ...)
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the worker's shared httpx.AsyncClient, creating it on first use."""
+    import httpx
+
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT),
+            limits=httpx.Limits(max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,336 @@
+"""
+Application logging.
+
+Log calls only enqueue: the QueueHandler on the root logger interpolates the message
+and puts the record on a bounded queue; a QueueListener thread formats it (JSON by
+default, tracebacks included) and writes it out, so stdout never blocks the event loop.
+When the queue is full records are dropped and counted instead of waiting.
+
+Before a record is enqueued it passes, in the calling thread:
+  - per-logger sampling of records below WARNING (LOG_SAMPLE_RATES),
+  - for the loggers listed in LOG_RATE_LIMITS only, a cap per message template and
+    second, below ERROR; once a second is over, a WARNING reports how many records
+    each capped template lost in it,
+  - the request id of the current request (RequestIdMiddleware), read from a ContextVar.
+
+Use lazy %-style arguments (`logger.info("Sent to %s", email)`): the message is only
+built for records that are kept, and the template is what rate caps count by.
+"""
+import logging
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+MAX_RATE_LIMIT_KEYS = 10_000
+
+# Id of the request being handled; copied into background tasks spawned from it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# LogRecord attributes that are not `extra=` fields
+_RECORD_ATTRIBUTES = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message", "asctime", "request_id", "suppressed", "taskName",
+    "color_message", # uvicorn's ANSI-colored copy of the message
+}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_rate_limit_filter: Optional["RateLimitFilter"] = None
+
+T = TypeVar("T")
+_UNRESOLVED = object()
+
+
+def parse_logger_values(spec: str, convert: Callable[[str], T]) -> Dict[str, T]:
+    """Parse per-logger settings such as "sqlalchemy.engine=0.01,uvicorn.access=0.1"."""
+    values = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            values[name.strip()] = convert(value.strip())
+    return values
+
+
+class _PerLoggerFilter(logging.Filter):
+    """A filter configured per logger name; children inherit the closest configured ancestor."""
+
+    def __init__(self, values: Dict[str, T], default: T):
+        super().__init__()
+        self.values = values
+        self.default = default
+        self._resolved: Dict[str, T] = {}
+
+    def _value(self, name: str) -> T:
+        value = self._resolved.get(name, _UNRESOLVED)
+        if value is _UNRESOLVED: # None is a valid value
+            value = self.default
+            candidate = name
+            while candidate:
+                if candidate in self.values:
+                    value = self.values[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = value
+        return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request_id, extras, exception."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed # Records of one template dropped by the rate cap in a second
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id (must run in the logging thread, not the listener)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = request_id_var.get()
+        if request_id is not None:
+            record.request_id = request_id
+        return True
+
+
+class SamplingFilter(_PerLoggerFilter):
+    """Keep only a share of the records below WARNING of the configured loggers (and their children)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__(rates, default=1.0)
+
+    @staticmethod
+    def parse(spec: str) -> Dict[str, float]:
+        """Parse "sqlalchemy.engine=0.01,uvicorn.access=0.1"."""
+        return parse_logger_values(spec, lambda rate: min(1.0, max(0.0, float(rate))))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._value(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RateLimitFilter(_PerLoggerFilter):
+    """
+    At most N records per second and message template for the configured loggers (and
+    their children), below ERROR; other loggers are never capped. When a second is over,
+    each template that lost records in it is reported through `report` (a WARNING with
+    a `suppressed` count), checked on the next capped record or by `flush`.
+    Counts are approximate across threads, which is fine for a cap.
+    """
+
+    def __init__(self, limits: Dict[str, int], report: Optional[Callable[[logging.LogRecord], None]] = None):
+        super().__init__(limits, default=None)
+        self.report = report
+        self._windows: Dict[Tuple[str, str], List[int]] = {} # key -> [second, passed, suppressed]
+        self._swept = 0 # Last second whose closed windows were reported
+
+    @staticmethod
+    def parse(spec: str) -> Dict[str, int]:
+        """Parse "app.services=50,httpx=20" (records per second and template)."""
+        return {name: limit for name, limit in parse_logger_values(spec, int).items() if limit > 0}
+
+    def _report(self, key: Tuple[str, str], suppressed: int) -> None:
+        if self.report is None:
+            return
+        record = logging.LogRecord(
+            key[0], logging.WARNING, __file__, 0,
+            "Suppressed %d records over the rate limit of %d/s: %s", (suppressed, self._value(key[0]), key[1]),
+            None,
+        )
+        record.suppressed = suppressed
+        self.report(record)
+
+    def flush(self, before: Optional[int] = None) -> None:
+        """Report and drop the windows of seconds before `before` (all windows by default)."""
+        for key, window in list(self._windows.items()):
+            if before is None or window[0] < before:
+                self._windows.pop(key, None)
+                if window[2]:
+                    self._report(key, window[2])
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        limit = self._value(record.name)
+        if limit is None:
+            return True
+        second = int(time.monotonic())
+        if second != self._swept:
+            self._swept = second
+            self.flush(before=second) # Closed windows: report their suppressed counts, free the keys
+        key = (record.name, str(record.msg))
+        window = self._windows.get(key)
+        if window is None:
+            if len(self._windows) >= MAX_RATE_LIMIT_KEYS:
+                self.flush() # Unbounded templates (f-strings); report and start over rather than grow
+            window = self._windows[key] = [second, 0, 0]
+        if window[1] >= limit:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread and never blocks on a full queue."""
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Interpolate now, while the arguments can't change or be touched from another thread;
+        # the JSON/text formatting and the traceback rendering happen in the listener
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # SimpleQueue: a C-level put without the lock/condition of queue.Queue; bounded here
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+def _formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "text":
+        return logging.Formatter(TEXT_FORMAT, defaults={"request_id": "-"})
+    return JsonFormatter()
+
+
+def configure_logging(level: Optional[int] = None) -> None:
+    """
+    Configure application logging (idempotent).
+    Called from the app lifespan instead of at import time, so importing modules
+    never reconfigures the root logger.
+    """
+    global _listener, _queue_handler, _rate_limit_filter
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(_formatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(log_queue, max_size=settings.LOG_QUEUE_SIZE)
+    sample_rates = SamplingFilter.parse(settings.LOG_SAMPLE_RATES)
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+    rate_limits = RateLimitFilter.parse(settings.LOG_RATE_LIMITS)
+    if rate_limits:
+        # Reports skip the filters (they would be sampled or capped themselves)
+        _rate_limit_filter = RateLimitFilter(rate_limits, report=lambda record: handler.enqueue(handler.prepare(record)))
+        handler.addFilter(_rate_limit_filter)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level if level is not None else settings.LOG_LEVEL.upper())
+    # uvicorn installs its own (blocking) stream handlers; route its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+    # SQL statement logging goes through the same pipeline (and LOG_SAMPLE_RATES), never engine echo
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.DB_ECHO else logging.WARNING)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    _queue_handler = handler
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread (end of the app lifespan)."""
+    global _listener, _queue_handler, _rate_limit_filter
+    if _listener is None:
+        return
+    if _rate_limit_filter is not None:
+        _rate_limit_filter.flush() # Report what the last seconds suppressed
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    if _queue_handler.dropped:
+        # Stderr directly: the pipeline is gone
+        print(f"logging: dropped {_queue_handler.dropped} record(s) on a full queue", file=sys.stderr)
+    _listener = None
+    _queue_handler = None
+    _rate_limit_filter = None
+
+
+def dropped_records() -> int:
+    """Records dropped on a full queue since logging was configured."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+class RequestIdMiddleware:
+    """
+    Give every request an id (the client's X-Request-ID if well-formed, else a new one),
+    expose it to log records through `request_id_var` and echo it in the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers[REQUEST_ID_HEADER] = request_id
+                message["headers"] = headers.raw
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,298 @@
+"""
+Rate limiting for expensive unauthenticated endpoints (bcrypt, JWT, SMTP).
+
+Counters use the sliding-window approximation: the hits of the current fixed window
+plus the previous window's hits weighted by how much of it still overlaps the sliding
+window. Each key needs only (window number, current hits, previous hits), so memory
+per key is constant and the in-memory table is capped at RATE_LIMIT_MAX_KEYS entries.
+
+Coalescing (one password-reset email per address and window) uses marks instead of
+counters: `mark` records when the action actually happened and `marked_within` checks
+against that, so suppressed requests never extend the window.
+
+Backends:
+    memory   - per worker process (default)
+    postgres - shared through the UNLOGGED rate_limit_counters table, so limits hold
+               across workers; falls back to memory if the database is unavailable
+"""
+import hashlib
+import logging
+import math
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Limit:
+    hits: int
+    window_seconds: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        """Parse "5/minute", "100/hour", "10/30 seconds", "10/5 minutes" or "10/30" (hits per N seconds)."""
+        hits, _, per = spec.partition("/")
+        count, _, unit = per.strip().lower().partition(" ")
+        if not count.isdigit(): # "5/minute"
+            count, unit = "1", count or "minute"
+        unit = unit.strip()
+        multiplier = _UNITS.get(unit.rstrip("s") if unit else "second")
+        if not hits.strip().isdigit() or multiplier is None or int(count) <= 0:
+            raise ValueError(f"Invalid rate limit {spec!r}, expected e.g. '5/minute' or '10/30 seconds'")
+        return cls(hits=int(hits), window_seconds=int(count) * multiplier)
+
+
+def _weighted_count(current: int, previous: int, window_seconds: int, now: float) -> float:
+    elapsed_share = (now % window_seconds) / window_seconds
+    return current + previous * (1.0 - elapsed_share)
+
+
+def _retry_after(current: int, previous: int, limit: Limit, now: float) -> int:
+    """Seconds until the weighted count is expected to drop back within the limit (a hint)."""
+    offset = now % limit.window_seconds
+    wait = limit.window_seconds - offset # Until the window rolls over
+    if previous and current <= limit.hits:
+        # Previous-window hits decay linearly over the current window
+        decayed_at = limit.window_seconds * (1.0 - (limit.hits - current) / previous)
+        wait = min(wait, decayed_at - offset)
+    return max(1, math.ceil(wait))
+
+
+class InMemoryBackend:
+    """Per-process counters in a bounded LRU table."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> [window number, hits in that window, hits in the window before]
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._marks: "OrderedDict[str, float]" = OrderedDict() # key -> time of the last mark
+
+    async def hit(self, key: str, limit: Limit, now: float) -> Tuple[int, int]:
+        """Record a hit; return (hits in the current window, hits in the previous window)."""
+        window = int(now // limit.window_seconds)
+        entry = self._counters.get(key)
+        if entry is None:
+            entry = [window, 0, 0]
+            self._counters[key] = entry
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False) # Evict the least recently used key
+        else:
+            self._counters.move_to_end(key)
+            if entry[0] != window:
+                # Roll forward: the old current window becomes "previous" only if adjacent
+                entry[2] = entry[1] if entry[0] == window - 1 else 0
+                entry[1] = 0
+                entry[0] = window
+        entry[1] += 1
+        return entry[1], entry[2]
+
+    async def last_mark(self, key: str) -> Optional[float]:
+        return self._marks.get(key)
+
+    async def mark(self, key: str, now: float) -> None:
+        self._marks[key] = now
+        self._marks.move_to_end(key)
+        if len(self._marks) > self.max_keys:
+            self._marks.popitem(last=False)
+
+
+class PostgresBackend:
+    """
+    Counters shared by all workers, stored in the UNLOGGED rate_limit_counters table.
+    Marks are rows of the same table with window_start set to the time of the mark.
+    Keys are stored as their SHA-256 hex digest: they can embed client input (the login
+    username) of any length, and the key column is String(255).
+    """
+
+    CLEANUP_PROBABILITY = 0.001 # Expired windows are deleted by roughly one hit in a thousand
+    RETENTION_SECONDS = 2 * 86400 # Longer than any configured window
+
+    @staticmethod
+    def _stored_key(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    async def hit(self, key: str, limit: Limit, now: float) -> Tuple[int, int]:
+        from sqlalchemy import delete, select
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.db.database import get_engine
+        from app.db.models.rate_limit_model import RateLimitCounter
+
+        key = self._stored_key(key)
+        window_start = int(now // limit.window_seconds) * limit.window_seconds
+        upsert = (
+            insert(RateLimitCounter)
+            .values(key=key, window_start=window_start, hits=1)
+            .on_conflict_do_update(
+                index_elements=[RateLimitCounter.key, RateLimitCounter.window_start],
+                set_={"hits": RateLimitCounter.hits + 1},
+            )
+            .returning(RateLimitCounter.hits)
+        )
+        previous_hits = select(RateLimitCounter.hits).where(
+            RateLimitCounter.key == key,
+            RateLimitCounter.window_start == window_start - limit.window_seconds,
+        )
+        async with get_engine().begin() as connection:
+            current = (await connection.execute(upsert)).scalar_one()
+            previous = (await connection.execute(previous_hits)).scalar_one_or_none() or 0
+            if random.random() < self.CLEANUP_PROBABILITY:
+                await connection.execute(
+                    delete(RateLimitCounter).where(RateLimitCounter.window_start < now - self.RETENTION_SECONDS)
+                )
+        return current, previous
+
+    async def last_mark(self, key: str) -> Optional[float]:
+        from sqlalchemy import func, select
+
+        from app.db.database import get_engine
+        from app.db.models.rate_limit_model import RateLimitCounter
+
+        key = self._stored_key(key)
+
+        async with get_engine().connect() as connection:
+            return (await connection.execute(
+                select(func.max(RateLimitCounter.window_start)).where(RateLimitCounter.key == key)
+            )).scalar_one_or_none()
+
+    async def mark(self, key: str, now: float) -> None:
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.db.database import get_engine
+        from app.db.models.rate_limit_model import RateLimitCounter
+
+        key = self._stored_key(key)
+
+        async with get_engine().begin() as connection:
+            await connection.execute(
+                insert(RateLimitCounter)
+                .values(key=key, window_start=int(now), hits=1)
+                .on_conflict_do_nothing(index_elements=[RateLimitCounter.key, RateLimitCounter.window_start])
+            ) # Old marks are deleted with expired counter windows
+
+
+class RateLimiter:
+    def __init__(self):
+        self._memory: Optional[InMemoryBackend] = None
+        self._postgres: Optional[PostgresBackend] = None
+
+    def _memory_backend(self) -> InMemoryBackend:
+        if self._memory is None:
+            self._memory = InMemoryBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+        return self._memory
+
+    async def _call(self, method: str, *args):
+        if settings.RATE_LIMIT_BACKEND == "postgres":
+            if self._postgres is None:
+                self._postgres = PostgresBackend()
+            try:
+                return await getattr(self._postgres, method)(*args)
+            except Exception as e: # Keep limiting locally rather than failing the request
+                logger.warning("Shared rate-limit backend unavailable, using in-memory counters: %s", e)
+        return await getattr(self._memory_backend(), method)(*args)
+
+    async def _hit(self, key: str, limit: Limit, now: float) -> Tuple[int, int]:
+        return await self._call("hit", key, limit, now)
+
+    async def check(self, key: str, limit: Limit) -> Tuple[bool, int]:
+        """
+        Count a hit for `key` and decide whether it is within `limit`.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return True, 0
+        now = time.time()
+        current, previous = await self._hit(key, limit, now)
+        if _weighted_count(current, previous, limit.window_seconds, now) <= limit.hits:
+            return True, 0
+        return False, _retry_after(current, previous, limit, now)
+
+    async def enforce(self, key: str, limit: Limit) -> None:
+        """Raise 429 Too Many Requests if `key` is over `limit`."""
+        allowed, retry_after = await self.check(key, limit)
+        if not allowed:
+            logger.info("Rate limit exceeded for %s", key)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    async def marked_within(self, key: str, window_seconds: int) -> bool:
+        """
+        True if `key` was marked less than `window_seconds` ago (used to coalesce repeats).
+        Checking doesn't count: only `mark`, called once the action really happened, starts a window.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return False
+        last = await self._call("last_mark", key)
+        return last is not None and time.time() - last < window_seconds
+
+    async def mark(self, key: str) -> None:
+        """Record that the action coalesced under `key` happened now."""
+        if settings.RATE_LIMIT_ENABLED:
+            await self._call("mark", key, time.time())
+
+
+rate_limiter = RateLimiter()
+
+# Settings holding a Limit spec
+LIMIT_SETTINGS = (
+    "RATE_LIMIT_LOGIN_PER_IP",
+    "RATE_LIMIT_LOGIN_PER_EMAIL",
+    "RATE_LIMIT_REGISTER_PER_IP",
+    "RATE_LIMIT_FORGOT_PASSWORD_PER_IP",
+    "RATE_LIMIT_RESET_PASSWORD_PER_IP",
+)
+
+_parsed_limits: Dict[str, Limit] = {}
+
+
+def load_limits() -> None:
+    """Parse every configured limit (app start-up), so a bad value fails the boot rather than requests."""
+    for setting_name in LIMIT_SETTINGS:
+        spec = getattr(settings, setting_name)
+        try:
+            _parsed_limits[setting_name] = Limit.parse(spec)
+        except ValueError as e:
+            raise ValueError(f"{setting_name}: {e}") from None
+
+
+def _limit_from_settings(setting_name: str) -> Limit:
+    limit = _parsed_limits.get(setting_name)
+    if limit is None: # Used outside the app lifespan (scripts)
+        limit = _parsed_limits[setting_name] = Limit.parse(getattr(settings, setting_name))
+    return limit
+
+
+def client_ip(request: Request) -> str:
+    """Client address (uvicorn rewrites it from X-Forwarded-For for trusted proxies)."""
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_setting(key: str, setting_name: str) -> None:
+    """Enforce the limit configured in `settings.<setting_name>` for `key`."""
+    await rate_limiter.enforce(key, _limit_from_settings(setting_name))
+
+
+def limit_by_ip(scope: str, setting_name: str):
+    """
+    FastAPI dependency limiting an endpoint per client IP, e.g.
+    `dependencies=[Depends(limit_by_ip("login", "RATE_LIMIT_LOGIN_PER_IP"))]`.
+    Runs before the endpoint body, so rejected requests never reach bcrypt or SMTP.
+    """
+    async def dependency(request: Request) -> None:
+        await enforce_setting(f"{scope}:ip:{client_ip(request)}", setting_name)
+    return dependency
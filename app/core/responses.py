@@ -0,0 +1,63 @@
+import enum
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Default JSON response class of the app.
+
+    - bytes are sent as-is (already serialized JSON)
+    - Pydantic models are serialized straight to bytes by pydantic-core, with no dict round trip
+    - everything else (dicts produced by FastAPI's response_model handling) goes through orjson
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return pydantic_core.to_json(content)
+        return orjson.dumps(content, default=_orjson_default, option=_ORJSON_OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def schema_response(
+    schema: Any, value: Any, status_code: int = 200, headers: Optional[dict] = None
+) -> ORJSONResponse:
+    """
+    Validate `value` (ORM objects, models or plain data) against `schema` and serialize it
+    directly to JSON bytes in pydantic-core.
+
+    Routes returning large payloads use this instead of relying on `response_model`, which
+    would validate, dump to a dict and then encode that dict again. Keep `response_model`
+    on the route for the OpenAPI docs.
+
+    Example:
+        return schema_response(List[ContentSummary], rows)
+    """
+    adapter = _type_adapter(schema)
+    validated = adapter.validate_python(value, from_attributes=True)
+    return ORJSONResponse(adapter.dump_json(validated), status_code=status_code, headers=headers)
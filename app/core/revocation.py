@@ -0,0 +1,182 @@
+"""
+Token revocation (logout, single-use password reset tokens).
+
+Revoked token ids (`jti`) are stored in the revoked_tokens table. Each worker mirrors
+the table so `is_revoked` normally costs a few hashes and no database round trip:
+
+  - a Bloom filter built from all unexpired revocations,
+  - an exact set of revocations seen since the filter was built (made by this
+    worker, or pulled every REVOCATION_REFRESH_SECONDS by `revoked_at`);
+    when it outgrows REVOCATION_EXACT_SET_MAX the filter is rebuilt.
+
+A Bloom hit that is not in the exact set may be a false positive
+(REVOCATION_BLOOM_FALSE_POSITIVE_RATE), so it is confirmed with a primary-key lookup.
+Revocations made by other workers take effect here within REVOCATION_REFRESH_SECONDS.
+Expired rows are purged every REVOCATION_PURGE_SECONDS.
+
+The filter is loaded in the app lifespan (`load`), before traffic. Until a filter could
+be loaded, checks fail closed: they wait for a load in progress, then fall back to a
+primary-key lookup per token.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import get_engine
+from app.db.models.revoked_token_model import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Re-read rows revoked slightly before the watermark: a transaction's now() is its start
+# time, so a revocation committed late can carry an earlier revoked_at
+REFRESH_OVERLAP = timedelta(seconds=30)
+CONFIRMED_CACHE_SIZE = 1024
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    def __init__(self):
+        self._bloom: Optional[BloomFilter] = None
+        self._recent: Set[str] = set()
+        self._confirmed: "OrderedDict[str, bool]" = OrderedDict() # Bloom hits already checked in the database
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = float("-inf")
+        self._purged_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def load(self) -> None:
+        """Build the filter (app start-up); on failure, checks use lookups until a refresh succeeds."""
+        await self._maybe_refresh()
+
+    async def is_revoked(self, jti: str) -> bool:
+        await self._maybe_refresh()
+        if jti in self._recent:
+            return True
+        if self._bloom is None: # Never loaded: no negative answer without the database
+            return await self._lookup(jti)
+        if jti not in self._bloom:
+            return False
+        confirmed = self._confirmed.get(jti)
+        if confirmed is None:
+            confirmed = await self._lookup(jti)
+            self._confirmed[jti] = confirmed
+            while len(self._confirmed) > CONFIRMED_CACHE_SIZE:
+                self._confirmed.popitem(last=False)
+        return confirmed
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: datetime) -> bool:
+        """
+        Record `jti` as revoked in the request's transaction. Returns False if it was
+        already revoked, which makes single-use tokens safe against concurrent replays.
+        """
+        result = await db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            .returning(RevokedToken.jti)
+        )
+        self._recent.add(jti)
+        self._confirmed.pop(jti, None)
+        return result.scalar_one_or_none() is not None
+
+    async def _lookup(self, jti: str) -> bool:
+        try:
+            async with get_engine().connect() as connection:
+                found = await connection.scalar(select(RevokedToken.jti).where(RevokedToken.jti == jti))
+        except Exception as e: # Fail closed: a possibly revoked token is rejected
+            logger.warning("Could not confirm token revocation, treating token as revoked: %s", e)
+            return True
+        return found is not None
+
+    async def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._refreshed_at < settings.REVOCATION_REFRESH_SECONDS:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._lock.locked():
+            if self._bloom is None:
+                async with self._lock: # The first load: wait for it rather than answer without a filter
+                    pass
+            return # Another request is refreshing; use the current state meanwhile
+        async with self._lock:
+            try:
+                if self._bloom is None or len(self._recent) > settings.REVOCATION_EXACT_SET_MAX:
+                    await self._rebuild()
+                else:
+                    await self._pull_new()
+                if time.monotonic() - self._purged_at >= settings.REVOCATION_PURGE_SECONDS:
+                    await self._purge_expired()
+            except Exception as e: # Keep the current state; revocations by other workers arrive late
+                logger.warning("Could not refresh token revocations: %s", e)
+            self._refreshed_at = time.monotonic()
+
+    async def _rebuild(self) -> None:
+        now = datetime.now(timezone.utc)
+        async with get_engine().connect() as connection:
+            watermark = await connection.scalar(select(func.max(RevokedToken.revoked_at)))
+            jtis = (await connection.scalars(select(RevokedToken.jti).where(RevokedToken.expires_at > now))).all()
+        # Sized with headroom so the rate holds until the exact set forces the next rebuild
+        bloom = BloomFilter(len(jtis) + settings.REVOCATION_EXACT_SET_MAX, settings.REVOCATION_BLOOM_FALSE_POSITIVE_RATE)
+        for jti in jtis:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._recent = set()
+        self._confirmed.clear()
+        self._watermark = watermark
+        logger.info("Loaded %d token revocations", len(jtis))
+
+    async def _pull_new(self) -> None:
+        query = select(RevokedToken.jti, RevokedToken.revoked_at)
+        if self._watermark is not None:
+            query = query.where(RevokedToken.revoked_at > self._watermark - REFRESH_OVERLAP)
+        async with get_engine().connect() as connection:
+            rows = (await connection.execute(query)).all()
+        for jti, revoked_at in rows:
+            self._recent.add(jti)
+            self._confirmed.pop(jti, None)
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+
+    async def _purge_expired(self) -> None:
+        async with get_engine().begin() as connection:
+            result = await connection.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at < datetime.now(timezone.utc))
+            )
+        self._purged_at = time.monotonic()
+        if result.rowcount:
+            logger.info("Purged %d expired token revocations", result.rowcount)
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,142 @@
+"""
+In-app scheduler for periodic background jobs (e.g. precomputing weekly summaries).
+
+Every worker runs the scheduler; a Postgres advisory lock per job makes sure only one
+of them executes a given run, the others skip it. Jobs must be idempotent for their
+scheduled time (a worker that wakes up after the winner finished will run it again),
+which is also what makes the catch-up of a run missed during a deploy safe.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WeeklySchedule:
+    """Once a week at weekday (Monday = 0) hour:minute, UTC."""
+    weekday: int
+    hour: int
+    minute: int = 0
+
+    def previous(self, now: datetime) -> datetime:
+        """The latest scheduled time at or before `now`."""
+        at = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        at -= timedelta(days=(now.weekday() - self.weekday) % 7)
+        return at if at <= now else at - timedelta(days=7)
+
+    def next(self, now: datetime) -> datetime:
+        """The first scheduled time after `now`."""
+        return self.previous(now) + timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str # Also the advisory lock key
+    schedule: WeeklySchedule
+    run: Callable[[datetime], Awaitable[None]] # Called with the scheduled time of the run
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg_try_advisory_lock (hash() differs between processes)."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    """
+    Try to take the session-level advisory lock for `name` without waiting; yields
+    whether it was acquired. The lock is held on a dedicated pooled connection until exit.
+    """
+    key = advisory_lock_key(name)
+    async with get_engine().connect() as connection:
+        acquired = await connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        await connection.commit() # Don't sit idle in a transaction while the job runs
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                try:
+                    await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                    await connection.commit()
+                except BaseException:
+                    # Never return a connection still holding the lock to the pool
+                    await connection.invalidate()
+                    raise
+
+
+class Scheduler:
+    def __init__(self):
+        self._jobs: List[Job] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_job(self, job: Job) -> None:
+        self._jobs.append(job)
+
+    def start(self) -> None:
+        """Start the scheduling loop (app lifespan)."""
+        if self._jobs and self._task is None:
+            self._task = asyncio.create_task(self._run_forever(), name="scheduler")
+
+    async def stop(self) -> None:
+        """Cancel the loop, including a job in progress (it resumes at its next run or catch-up)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._jobs = []
+
+    async def _run_forever(self) -> None:
+        now = _utcnow()
+        grace = timedelta(hours=settings.SCHEDULER_MISFIRE_GRACE_HOURS)
+        due: Dict[str, datetime] = {}
+        for job in self._jobs:
+            # A run missed shortly before start-up (deploy, restart) is caught up now
+            previous = job.schedule.previous(now)
+            due[job.name] = previous if now - previous <= grace else job.schedule.next(now)
+        jobs = {job.name: job for job in self._jobs}
+        while True:
+            name = min(due, key=due.get)
+            delay = (due[name] - _utcnow()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._run_job(jobs[name], due[name])
+            due[name] = jobs[name].schedule.next(max(due[name], _utcnow()))
+
+    async def _run_job(self, job: Job, scheduled_for: datetime) -> None:
+        try:
+            async with advisory_lock(job.name) as acquired:
+                if not acquired:
+                    logger.info("Skipping job %s: running in another worker", job.name)
+                    return
+                started = time.perf_counter()
+                logger.info("Running job %s scheduled for %s", job.name, scheduled_for.isoformat())
+                await job.run(scheduled_for)
+                logger.info("Job %s finished in %.1fs", job.name, time.perf_counter() - started)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Keep the scheduler alive; the job is retried at its next run
+            logger.exception("Job %s failed", job.name)
+
+
+scheduler = Scheduler()
@@ -1,4 +1,5 @@
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
 
 from jose import jwt, JWTError
@@ -35,9 +36,15 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    # jti identifies the token for revocation (logout), see app/core/revocation.py
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
 
+def _expiry(payload: dict) -> Optional[datetime]:
+    """The `exp` claim as an aware datetime (python-jose has already checked it is in the future)."""
+    exp = payload.get("exp")
+    return datetime.fromtimestamp(exp, tz=timezone.utc) if exp is not None else None
+
 def decode_access_token(token: str) -> Optional[TokenData]:
     """
     Decode JWT access token.
@@ -63,7 +70,7 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         except ValueError:
             return None # Subject is not a valid integer for user_id
             
-        return TokenData(user_id=user_id)
+        return TokenData(user_id=user_id, jti=payload.get("jti"), expires_at=_expiry(payload))
     except JWTError: # Catches various JWT errors like ExpiredSignatureError, InvalidTokenError
         return None
 def create_password_reset_token(email: str) -> str:
@@ -82,18 +89,20 @@ def create_password_reset_token(email: str) -> str:
     # Add a specific claim or use a different key/algorithm if you want to strictly
     # differentiate reset tokens from access tokens, but for simplicity,
     # using the same secret and algorithm but different expiry and subject format.
-    to_encode = {"exp": expire, "sub": email, "type": "reset"} # Added type claim for clarity
+    # jti makes the token single-use: it is revoked when the password is reset
+    to_encode = {"exp": expire, "sub": email, "type": "reset", "jti": uuid.uuid4().hex} # Added type claim for clarity
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def verify_password_reset_token(token: str) -> Optional[str]:
+def decode_password_reset_token(token: str) -> Optional[TokenData]:
     """
-    Verify the password reset token.
+    Decode a password reset token.
     
     Args:
         token: The JWT token string.
         
     Returns:
-        The email address (subject) if the token is valid and not expired, None otherwise.
+        TokenData with the email (subject), jti and expiry if the token is valid and
+        not expired, None otherwise.
     """
     try:
         payload = jwt.decode(
@@ -112,6 +121,20 @@ def verify_password_reset_token(token: str) -> Optional[str]:
         if "@" not in subject:
             return None 
 
-        return subject
+        return TokenData(email=subject, jti=payload.get("jti"), expires_at=_expiry(payload))
     except JWTError: # Catches various JWT errors like ExpiredSignatureError, InvalidTokenError
-        return None
\ No newline at end of file
+        return None
+
+def verify_password_reset_token(token: str) -> Optional[str]:
+    """
+    Verify the password reset token.
+    
+    Args:
+        token: The JWT token string.
+        
+    Returns:
+        The email address (subject) if the token is valid and not expired, None otherwise.
+        Does not check revocation; use decode_password_reset_token for the jti.
+    """
+    token_data = decode_password_reset_token(token)
+    return token_data.email if token_data else None
@@ -0,0 +1,265 @@
+"""
+Streaming multipart uploads (answer-sheet images, roster files).
+
+`receive_upload` feeds the raw request stream to python-multipart's push parser, so
+the file part is never held whole: each chunk goes straight into a SpooledTemporaryFile
+(in memory up to UPLOAD_SPOOL_MEMORY_BYTES, then on disk) while the SHA-256 is updated
+and the first bytes are sniffed for the real type. The request is rejected with 413 as
+soon as the body (counted as it is read, whatever Content-Length says) or the file part
+exceeds its cap, without reading the rest. Memory per upload is bounded
+by the spool threshold plus one chunk, whatever the file size.
+
+Stored files are content-addressed (UPLOAD_DIR/<sha[:2]>/<sha>); downstream stages
+(OCR, roster import) read them through `map_stored_file`, a read-only mmap.
+"""
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import HTTPException, Request, status
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+
+SNIFF_BYTES = 512 # Enough for every signature below
+MAX_FIELD_BYTES = 1024 # Non-file form fields (e.g. "purpose") are kept in memory up to this size
+MULTIPART_OVERHEAD_BYTES = 16 * 1024 # Boundaries, part headers and form fields allowed on top of the file cap
+MAX_PARTS = 8 # The file and a few small fields
+
+# 413 (named HTTP_413_CONTENT_TOO_LARGE in newer Starlette, the old name is deprecated there)
+PAYLOAD_TOO_LARGE = 413
+
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Leading bytes -> MIME type
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"%PDF-", "application/pdf"),
+)
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """Detect the type from the first bytes of a file; None if it is none of the supported ones."""
+    for signature, mime_type in _SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"PK\x03\x04"):
+        # The first zip entries of an Office Open XML workbook name its parts
+        return XLSX_MIME_TYPE if b"[Content_Types].xml" in head or b"xl/" in head else None
+    if head and b"\x00" not in head:
+        try:
+            head.decode("utf-8")
+        except UnicodeDecodeError as e:
+            if e.start < len(head) - 3: # Only a multi-byte character cut at the end is fine
+                return None
+        return "text/csv"
+    return None
+
+
+@dataclass
+class SpooledUpload:
+    """A received file part; `file` is positioned at the end, close it when done."""
+    file: tempfile.SpooledTemporaryFile
+    filename: Optional[str] = None
+    declared_type: Optional[str] = None # Client-sent Content-Type of the part (not trusted)
+    mime_type: Optional[str] = None # Sniffed from the content
+    size: int = 0
+    sha256: str = ""
+    fields: Dict[str, str] = field(default_factory=dict) # Other (small) form fields
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _disposition(headers: Dict[bytes, bytes]) -> Dict[bytes, bytes]:
+    _, params = parse_options_header(headers.get(b"content-disposition", b""))
+    return params
+
+
+class _FilePartReceiver:
+    """python-multipart callbacks: route the file part into the spool, hash and sniff as it arrives."""
+
+    def __init__(self, field_name: str, max_bytes: int):
+        self.field_name = field_name.encode()
+        self.max_bytes = max_bytes
+        self.upload = SpooledUpload(
+            file=tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MEMORY_BYTES)
+        )
+        self._hash = hashlib.sha256()
+        self._head = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._target: Optional[str] = None # "file", a field name, or None (ignored part)
+        self._field_value = bytearray()
+        self.parts = 0
+        self.found = False
+        self.complete = False # The file part's closing boundary was seen
+
+    def callbacks(self) -> Dict[str, object]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": lambda data, start, end: self._header_field.extend(memoryview(data)[start:end]),
+            "on_header_value": lambda data, start, end: self._header_value.extend(memoryview(data)[start:end]),
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self.parts += 1
+        if self.parts > MAX_PARTS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"More than {MAX_PARTS} form parts")
+        self._headers = {}
+        self._target = None
+
+    def on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        params = _disposition(self._headers)
+        name = params.get(b"name")
+        if name == self.field_name and b"filename" in params and not self.found:
+            self.found = True
+            self._target = "file"
+            self.upload.filename = os.path.basename(params[b"filename"].decode("utf-8", "replace")) or None
+            self.upload.declared_type = self._headers.get(b"content-type", b"").decode("latin-1") or None
+        elif name is not None and b"filename" not in params:
+            self._target = name.decode("utf-8", "replace")
+            self._field_value.clear()
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._target is None:
+            return
+        chunk = memoryview(data)[start:end] # No copy: hashed and written from the parser's buffer
+        if self._target != "file":
+            if len(self._field_value) + len(chunk) > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=PAYLOAD_TOO_LARGE, detail="Form field too large")
+            self._field_value.extend(chunk)
+            return
+        self.upload.size += len(chunk)
+        if self.upload.size > self.max_bytes:
+            raise HTTPException(
+                status_code=PAYLOAD_TOO_LARGE,
+                detail=f"File exceeds the {self.max_bytes} byte limit",
+            )
+        if len(self._head) < SNIFF_BYTES:
+            self._head.extend(chunk[: SNIFF_BYTES - len(self._head)])
+        self._hash.update(chunk)
+        self.upload.file.write(chunk)
+
+    def on_part_end(self) -> None:
+        if self._target == "file":
+            self.upload.sha256 = self._hash.hexdigest()
+            self.upload.mime_type = sniff_mime_type(bytes(self._head))
+            self.complete = True
+        elif self._target is not None:
+            self.upload.fields[self._target] = self._field_value.decode("utf-8", "replace")
+        self._target = None
+
+
+async def receive_upload(request: Request, max_bytes: int, field_name: str = "file") -> SpooledUpload:
+    """
+    Stream a multipart/form-data request body and return its `field_name` file part.
+    Raises 413 when the file exceeds `max_bytes` or the body exceeds it plus
+    MULTIPART_OVERHEAD_BYTES (declared or as read), 400 for a malformed body, too many
+    parts or a missing file part.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected multipart/form-data")
+    max_body_bytes = max_bytes + MULTIPART_OVERHEAD_BYTES
+    too_large = HTTPException(status_code=PAYLOAD_TOO_LARGE, detail=f"File exceeds the {max_bytes} byte limit")
+    declared_length = request.headers.get("content-length")
+    if declared_length and declared_length.isdigit() and int(declared_length) > max_body_bytes:
+        raise too_large # Rejected before reading any of the body
+
+    receiver = _FilePartReceiver(field_name, max_bytes)
+    # The body is capped here rather than by the parser's max_size, which only truncates
+    # (and keeps reading) past it; chunked bodies have no Content-Length to check up front
+    parser = MultipartParser(boundary, receiver.callbacks())
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_body_bytes:
+                raise too_large
+            if chunk:
+                parser.write(chunk)
+        parser.finalize()
+    except HTTPException:
+        receiver.upload.close()
+        raise
+    except Exception as e: # python-multipart errors for truncated or malformed bodies
+        receiver.upload.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Malformed multipart body: {e}")
+    if not receiver.found:
+        receiver.upload.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing file field '{field_name}'")
+    if not receiver.complete:
+        receiver.upload.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incomplete multipart body")
+    return receiver.upload
+
+
+def stored_path(sha256: str) -> Path:
+    return Path(settings.UPLOAD_DIR) / sha256[:2] / sha256
+
+
+def store_upload(upload: SpooledUpload) -> Path:
+    """
+    Persist a spooled upload under its content hash (blocking: run in a thread). Identical
+    content is stored once; the file appears atomically, so readers never see a partial one.
+    """
+    path = stored_path(upload.sha256)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    upload.file.seek(0)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".incoming-")
+    try:
+        with os.fdopen(descriptor, "wb") as target:
+            shutil.copyfileobj(upload.file, target, length=1024 * 1024)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return path
+
+
+@contextmanager
+def map_stored_file(sha256: str) -> Iterator[memoryview]:
+    """
+    Read-only, zero-copy view of a stored upload (pages are loaded by the OS on access).
+    Release slices taken from the view before the block ends.
+    """
+    with open(stored_path(sha256), "rb") as source:
+        if os.fstat(source.fileno()).st_size == 0:
+            yield memoryview(b"") # mmap cannot map empty files
+            return
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            mapped.close()
+
+
+def allowed_mime_types() -> List[str]:
+    return [mime_type.strip() for mime_type in settings.UPLOAD_ALLOWED_MIME_TYPES.split(",") if mime_type.strip()]
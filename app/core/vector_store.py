@@ -0,0 +1,81 @@
+"""
+ChromaDB access (curriculum and generated-content collections).
+
+With CHROMA_HOST set, workers talk to a Chroma server over HTTP; use this whenever the
+app runs more than one worker process. Without it, the embedded PersistentClient on
+CHROMA_DB_PATH is used; that store is not safe for concurrent writers from several
+processes, so only the process holding an exclusive lock on the directory opens it.
+In other workers the vector store is unavailable, which callers treat as a cache miss.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from app.core.config import settings
+
+# chromadb is heavy (ONNX runtime, ...): imported on first use, never at app start-up
+if TYPE_CHECKING:
+    import chromadb
+
+logger = logging.getLogger(__name__)
+
+WRITER_LOCK_FILE = ".writer.lock"
+
+# One client per worker, shared by the curriculum and generated-content collections
+_client: Optional["chromadb.api.ClientAPI"] = None
+_collections: Dict[str, Any] = {}
+_writer_lock: Optional[int] = None # Descriptor holding the embedded store's lock for this process
+
+
+def _lock_embedded_store() -> None:
+    """Take the single-writer lock on CHROMA_DB_PATH (held until the process exits)."""
+    global _writer_lock
+    if _writer_lock is not None:
+        return
+    try:
+        import fcntl
+    except ImportError: # Not POSIX (local development): nothing to enforce with
+        return
+    os.makedirs(settings.CHROMA_DB_PATH, exist_ok=True)
+    descriptor = os.open(os.path.join(settings.CHROMA_DB_PATH, WRITER_LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(descriptor)
+        raise RuntimeError(
+            f"The embedded ChromaDB store {settings.CHROMA_DB_PATH} is open in another process; "
+            "set CHROMA_HOST to share a Chroma server between workers"
+        )
+    _writer_lock = descriptor
+
+
+def get_chroma_client() -> "chromadb.api.ClientAPI":
+    """
+    Return the worker's ChromaDB client, creating it on first use: an HttpClient for
+    CHROMA_HOST, else the embedded store (raises RuntimeError if another process has it).
+    """
+    import chromadb
+
+    global _client
+    if _client is None:
+        if settings.CHROMA_HOST:
+            _client = chromadb.HttpClient(host=settings.CHROMA_HOST, port=settings.CHROMA_PORT)
+        else:
+            _lock_embedded_store()
+            _client = chromadb.PersistentClient(path=settings.CHROMA_DB_PATH)
+    return _client
+
+
+def get_collection(name: str, metadata: Optional[Dict[str, Any]] = None):
+    """Return (creating if needed) a collection; cached per worker."""
+    collection = _collections.get(name)
+    if collection is None:
+        collection = get_chroma_client().get_or_create_collection(name=name, metadata=metadata)
+        _collections[name] = collection
+    return collection
+
+
+async def run_in_thread(function, *args, **kwargs):
+    """ChromaDB's client is synchronous (embedding + index search); keep it off the event loop."""
+    return await asyncio.to_thread(function, *args, **kwargs)
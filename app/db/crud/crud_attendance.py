@@ -0,0 +1,34 @@
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models.attendance_year_model import AttendanceYear
+from app.db.models.student_model import Student
+
+async def get_class_attendance_year(
+    db: AsyncSession,
+    teacher_id: int,
+    year_start: date,
+    grade_level: Optional[str] = None,
+) -> List[Row]:
+    """
+    Retrieve a teacher's students with their compact attendance codes for one academic year.
+    One row per student: (student_id, full_name, codes); codes is None when nothing is recorded.
+    """
+    query = (
+        select(Student.id, Student.full_name, AttendanceYear.codes)
+        .outerjoin(
+            AttendanceYear,
+            and_(AttendanceYear.student_id == Student.id, AttendanceYear.year_start == year_start),
+        )
+        .filter(Student.teacher_id == teacher_id)
+        .order_by(Student.full_name, Student.id)
+    )
+    if grade_level is not None:
+        query = query.filter(Student.grade_level == grade_level)
+    result = await db.execute(query)
+    return list(result.all())
@@ -0,0 +1,179 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, literal_column, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import undefer
+
+from app.db.models.content_model import Content, ContentType, SEARCH_CONFIG
+
+def question_count_expr():
+    """
+    SQL expression for the number of questions in Content.data ("questions" array).
+    Evaluates to 0 when the content has no questions array (e.g. teaching material).
+    """
+    questions = Content.data["questions"]
+    return case(
+        (func.jsonb_typeof(questions) == "array", func.jsonb_array_length(questions)),
+        else_=0,
+    )
+
+async def get_content_by_id(
+    db: AsyncSession,
+    content_id: int,
+    teacher_id: int,
+    with_data: bool = False,
+    with_answer_key: bool = False,
+) -> Optional[Content]:
+    """
+    Retrieve a content item by its ID, scoped to the owning teacher.
+    The JSONB payload columns are deferred; request them explicitly when needed.
+    """
+    query = select(Content).filter(Content.id == content_id, Content.teacher_id == teacher_id)
+    if with_data:
+        query = query.options(undefer(Content.data))
+    if with_answer_key:
+        query = query.options(undefer(Content.answer_key))
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def get_content_with_payload(db: AsyncSession, content_id: int) -> Optional[Content]:
+    """
+    Retrieve a content item with data and answer key, whoever owns it.
+    Only for copying reusable generated content; use get_content_by_id for anything user-facing.
+    """
+    result = await db.execute(
+        select(Content)
+        .filter(Content.id == content_id)
+        .options(undefer(Content.data), undefer(Content.answer_key))
+    )
+    return result.scalars().first()
+
+async def create_content(
+    db: AsyncSession,
+    teacher_id: int,
+    title: str,
+    content_type: ContentType,
+    description: Optional[str] = None,
+    data: Optional[Any] = None,
+    answer_key: Optional[Any] = None,
+) -> Content:
+    """
+    Create a content item for a teacher.
+    """
+    db_content = Content(
+        title=title,
+        content_type=content_type,
+        description=description,
+        data=data,
+        answer_key=answer_key,
+        teacher_id=teacher_id,
+    )
+    db.add(db_content)
+    await db.commit()
+    # Only the server-set columns: the payload stays as assigned (sessions don't expire on commit)
+    await db.refresh(db_content, attribute_names=["created_at", "updated_at"])
+    return db_content
+
+async def update_content(db: AsyncSession, content: Content, content_in: Dict[str, Any]) -> Content:
+    """
+    Update the given fields of a content item (load it with its payload first when
+    data/answer_key are read afterwards).
+    """
+    for field, value in content_in.items():
+        setattr(content, field, value)
+    db.add(content)
+    await db.commit()
+    await db.refresh(content, attribute_names=["updated_at"])
+    return content
+
+async def get_content_summaries(db: AsyncSession, content_ids: List[int], teacher_id: int) -> List[Content]:
+    """
+    Several content items of a teacher by id in one query, summary columns only
+    (no payload), in no particular order.
+    """
+    if not content_ids:
+        return []
+    result = await db.execute(
+        select(Content).filter(Content.id.in_(content_ids), Content.teacher_id == teacher_id)
+    )
+    return list(result.scalars().all())
+
+async def list_content_for_indexing(
+    db: AsyncSession, parameter_keys: Tuple[str, ...], after_id: int = 0, limit: int = 500
+) -> List[Tuple[Content, Dict[str, Any]]]:
+    """
+    One keyset page (id > after_id) of all content for (re)building the reuse index:
+    summary columns plus the given top-level keys of Content.data, without loading the payload.
+    """
+    parameter_columns = [Content.data[key].astext.label(key) for key in parameter_keys]
+    result = await db.execute(
+        select(Content, *parameter_columns)
+        .filter(Content.id > after_id)
+        .order_by(Content.id)
+        .limit(limit)
+    )
+    return [
+        (row[0], {key: value for key, value in zip(parameter_keys, row[1:]) if value is not None})
+        for row in result.all()
+    ]
+
+async def list_content_for_teacher(
+    db: AsyncSession,
+    teacher_id: int,
+    content_type: Optional[ContentType] = None,
+    data_filters: Optional[Dict[str, Any]] = None,
+    min_questions: Optional[int] = None,
+    max_questions: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Content]:
+    """
+    List a teacher's content items, newest first, without loading the payload columns.
+
+    Args:
+        data_filters: Key/value pairs that must be contained in Content.data
+            (e.g. {"subject": "Biology", "grade_level": "Grade 9"}). Served by the GIN index.
+        min_questions / max_questions: Bounds on the number of questions in Content.data.
+    """
+    query = select(Content).filter(Content.teacher_id == teacher_id)
+    if content_type is not None:
+        query = query.filter(Content.content_type == content_type)
+    if data_filters:
+        query = query.filter(Content.data.contains(data_filters))
+    if min_questions is not None:
+        query = query.filter(question_count_expr() >= min_questions)
+    if max_questions is not None:
+        query = query.filter(question_count_expr() <= max_questions)
+    query = query.order_by(Content.created_at.desc(), Content.id.desc()).offset(skip).limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+async def search_content(
+    db: AsyncSession,
+    teacher_id: int,
+    tsquery: str,
+    limit: int = 20,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[Content, float]]:
+    """
+    Full-text search over a teacher's content, best matches first.
+
+    Args:
+        tsquery: A to_tsquery() expression (e.g. "photo:* & grade:*").
+        after: Keyset cursor (rank, id) of the last row of the previous page.
+
+    Returns:
+        (content, rank) pairs ordered by rank DESC, id DESC. Payload columns are not loaded.
+    """
+    query_expr = func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), tsquery)
+    rank_expr = func.ts_rank_cd(Content.search_vector, query_expr)
+    query = (
+        select(Content, rank_expr.label("rank"))
+        .filter(Content.teacher_id == teacher_id, Content.search_vector.op("@@")(query_expr))
+    )
+    if after is not None:
+        query = query.filter(tuple_(rank_expr, Content.id) < tuple_(after[0], after[1]))
+    query = query.order_by(rank_expr.desc(), Content.id.desc()).limit(limit)
+    result = await db.execute(query)
+    return [(content, rank) for content, rank in result.all()]
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models.content_model import Content
+from app.db.models.grade_model import Grade
+from app.db.models.student_model import Student
+
+def grade_percentage_expr():
+    """Score as a percentage of max_score; NULL when max_score is missing or zero."""
+    return case((Grade.max_score > 0, Grade.score * 100.0 / Grade.max_score), else_=None)
+
+def _teacher_students(teacher_id: int, grade_level: Optional[str]):
+    query = select(Student.id).filter(Student.teacher_id == teacher_id)
+    if grade_level is not None:
+        query = query.filter(Student.grade_level == grade_level)
+    return query
+
+async def get_grade_fingerprint(db: AsyncSession, content_id: int) -> Tuple[Any, ...]:
+    """
+    Return a cheap aggregate that changes whenever a grade of the content is
+    added, removed or updated. Used to validate cached analytics.
+    """
+    result = await db.execute(
+        select(
+            func.count(Grade.id),
+            func.max(Grade.id),
+            func.max(func.coalesce(Grade.updated_at, Grade.created_at)),
+        ).filter(Grade.content_id == content_id)
+    )
+    return tuple(result.one())
+
+async def get_grade_columns(db: AsyncSession, content_id: int) -> List[Row]:
+    """
+    Retrieve only the columns needed for analytics for every grade of a content item.
+    Rows are (student_id, score, max_score, question_scores); no ORM objects are built.
+    """
+    result = await db.execute(
+        select(Grade.student_id, Grade.score, Grade.max_score, Grade.question_scores)
+        .filter(Grade.content_id == content_id)
+        .order_by(Grade.student_id)
+    )
+    return list(result.all())
+
+async def get_latest_grades_for_teacher(
+    db: AsyncSession, teacher_id: int, per_student: int, grade_level: Optional[str] = None
+) -> List[Row]:
+    """
+    The `per_student` most recent grades of each of a teacher's students, in one query
+    (row_number() over each student's grades). Rows are (student_id, content_id, title,
+    content_type, score, max_score, percentage, grading_date), newest first per student.
+    """
+    ranked = (
+        select(
+            Grade.student_id,
+            Grade.content_id,
+            Grade.score,
+            Grade.max_score,
+            grade_percentage_expr().label("percentage"),
+            Grade.grading_date,
+            func.row_number().over(
+                partition_by=Grade.student_id,
+                order_by=(Grade.grading_date.desc().nulls_last(), Grade.id.desc()),
+            ).label("position"),
+        )
+        .filter(Grade.student_id.in_(_teacher_students(teacher_id, grade_level)))
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            ranked.c.student_id,
+            ranked.c.content_id,
+            Content.title,
+            Content.content_type,
+            ranked.c.score,
+            ranked.c.max_score,
+            ranked.c.percentage,
+            ranked.c.grading_date,
+        )
+        .join(Content, Content.id == ranked.c.content_id)
+        .filter(ranked.c.position <= per_student)
+        .order_by(ranked.c.student_id, ranked.c.position)
+    )
+    return list(result.all())
+
+async def get_grade_averages_for_teacher(
+    db: AsyncSession,
+    teacher_id: int,
+    grade_level: Optional[str] = None,
+    graded_from: Optional[datetime] = None,
+    graded_before: Optional[datetime] = None,
+) -> List[Row]:
+    """
+    Per-student grade aggregates for a teacher's students in one GROUP BY query,
+    optionally over grades with graded_from <= grading_date < graded_before.
+    Rows are (student_id, graded_count, average_percentage); students without grades are absent.
+    """
+    query = (
+        select(
+            Grade.student_id,
+            func.count(Grade.id),
+            func.avg(grade_percentage_expr()),
+        )
+        .filter(Grade.student_id.in_(_teacher_students(teacher_id, grade_level)))
+        .group_by(Grade.student_id)
+    )
+    if graded_from is not None:
+        query = query.filter(Grade.grading_date >= graded_from)
+    if graded_before is not None:
+        query = query.filter(Grade.grading_date < graded_before)
+    result = await db.execute(query)
+    return list(result.all())
+
+async def get_grade_changes_for_teacher(
+    db: AsyncSession, teacher_id: int, graded_from: datetime, graded_before: datetime
+) -> Tuple[int, Optional[datetime]]:
+    """
+    (number of grades, last time one was created or updated) for a teacher's students'
+    grades with graded_from <= grading_date < graded_before. Used to validate precomputed
+    summaries: any insert or delete changes the count, any edit the time.
+    """
+    result = await db.execute(
+        select(func.count(Grade.id), func.max(func.coalesce(Grade.updated_at, Grade.created_at)))
+        .filter(Grade.student_id.in_(_teacher_students(teacher_id, None)))
+        .filter(Grade.grading_date >= graded_from, Grade.grading_date < graded_before)
+    )
+    count, last_changed = result.one()
+    return count, last_changed
@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models.student_model import Student
+
+async def get_student_by_id(db: AsyncSession, student_id: int, teacher_id: int) -> Optional[Student]:
+    """Retrieve a student by ID, scoped to the owning teacher."""
+    result = await db.execute(
+        select(Student).filter(Student.id == student_id, Student.teacher_id == teacher_id)
+    )
+    return result.scalars().first()
+
+async def get_students_for_teacher(
+    db: AsyncSession, teacher_id: int, grade_level: Optional[str] = None
+) -> List[Student]:
+    """List a teacher's students ordered by name."""
+    query = select(Student).filter(Student.teacher_id == teacher_id)
+    if grade_level is not None:
+        query = query.filter(Student.grade_level == grade_level)
+    result = await db.execute(query.order_by(Student.full_name, Student.id))
+    return list(result.scalars().all())
@@ -0,0 +1,70 @@
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models.upload_model import Upload
+from app.db.models.user_model import User
+
+async def get_upload(db: AsyncSession, upload_id: int, teacher_id: int) -> Optional[Upload]:
+    """
+    Retrieve one of a teacher's uploads.
+    """
+    result = await db.execute(select(Upload).filter(Upload.id == upload_id, Upload.teacher_id == teacher_id))
+    return result.scalars().first()
+
+async def get_upload_by_hash(db: AsyncSession, teacher_id: int, sha256: str) -> Optional[Upload]:
+    """
+    Retrieve a teacher's upload of the file with this content hash, if any.
+    """
+    result = await db.execute(select(Upload).filter(Upload.teacher_id == teacher_id, Upload.sha256 == sha256))
+    return result.scalars().first()
+
+async def list_uploads_for_teacher(db: AsyncSession, teacher_id: int, skip: int = 0, limit: int = 100) -> List[Upload]:
+    """
+    List a teacher's uploads, newest first.
+    """
+    result = await db.execute(
+        select(Upload)
+        .filter(Upload.teacher_id == teacher_id)
+        .order_by(Upload.created_at.desc(), Upload.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_teacher_usage(db: AsyncSession, teacher_id: int, lock: bool = False) -> int:
+    """
+    Bytes stored by a teacher. With lock=True the teacher's user row is locked until the
+    transaction ends, so concurrent uploads check the quota one after the other.
+    """
+    if lock:
+        await db.execute(select(User.id).filter(User.id == teacher_id).with_for_update())
+    result = await db.execute(select(func.coalesce(func.sum(Upload.size), 0)).filter(Upload.teacher_id == teacher_id))
+    return int(result.scalar_one())
+
+async def create_upload(
+    db: AsyncSession,
+    teacher_id: int,
+    sha256: str,
+    size: int,
+    mime_type: str,
+    filename: Optional[str] = None,
+    purpose: Optional[str] = None,
+) -> Upload:
+    """
+    Record an upload (its bytes must already be in the store).
+    """
+    db_upload = Upload(
+        teacher_id=teacher_id,
+        sha256=sha256,
+        size=size,
+        mime_type=mime_type,
+        filename=filename,
+        purpose=purpose,
+    )
+    db.add(db_upload)
+    await db.commit()
+    await db.refresh(db_upload)
+    return db_upload
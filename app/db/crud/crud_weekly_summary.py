@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import undefer
+
+from app.db.models.teacher_weekly_summary_model import TeacherWeeklySummary
+from app.db.models.user_model import User, UserRole
+
+async def get_weekly_summary(
+    db: AsyncSession, teacher_id: int, week_start: date, with_report: bool = False
+) -> Optional[TeacherWeeklySummary]:
+    """
+    Retrieve a teacher's precomputed summary for a week; the xlsx report only if requested.
+    """
+    query = select(TeacherWeeklySummary).filter(
+        TeacherWeeklySummary.teacher_id == teacher_id,
+        TeacherWeeklySummary.week_start == week_start,
+    )
+    if with_report:
+        query = query.options(undefer(TeacherWeeklySummary.report_xlsx))
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def get_teachers_without_summary(
+    db: AsyncSession, week_start: date, computed_since: Optional[datetime] = None
+) -> List[int]:
+    """
+    Ids of active teachers with no summary for the week, or one computed before `computed_since`.
+    """
+    join_on = [
+        TeacherWeeklySummary.teacher_id == User.id,
+        TeacherWeeklySummary.week_start == week_start,
+    ]
+    if computed_since is not None:
+        join_on.append(TeacherWeeklySummary.computed_at >= computed_since)
+    result = await db.execute(
+        select(User.id)
+        .outerjoin(TeacherWeeklySummary, and_(*join_on))
+        .filter(User.role == UserRole.TEACHER, User.is_active.is_(True))
+        .filter(TeacherWeeklySummary.teacher_id.is_(None))
+        .order_by(User.id)
+    )
+    return list(result.scalars().all())
+
+async def upsert_weekly_summary(
+    db: AsyncSession,
+    teacher_id: int,
+    week_start: date,
+    payload: Dict[str, Any],
+    report_xlsx: Optional[bytes] = None,
+) -> None:
+    """
+    Insert or replace a teacher's summary for a week (computed_at is reset to now).
+    """
+    statement = insert(TeacherWeeklySummary).values(
+        teacher_id=teacher_id, week_start=week_start, payload=payload, report_xlsx=report_xlsx
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[TeacherWeeklySummary.teacher_id, TeacherWeeklySummary.week_start],
+        set_={
+            "payload": statement.excluded.payload,
+            "report_xlsx": statement.excluded.report_xlsx,
+            "computed_at": statement.excluded.computed_at,
+        },
+    )
+    await db.execute(statement)
+    await db.commit()
@@ -1,16 +1,15 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
-# Define the database URL from settings
-DATABASE_URL = settings.DATABASE_URL
-
-# Create an asynchronous engine
-engine = create_async_engine(DATABASE_URL, echo=True) # echo=True for logging SQL, remove in production
+# The engine is created on first use (see get_engine) rather than at import time,
+# so importing models or the app does not read settings or load the DB driver.
+_engine: Optional[AsyncEngine] = None
 
-# Create a session maker
+# Create a session maker (bound to the engine by get_engine)
 AsyncSessionLocal = sessionmaker(
-    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -20,8 +19,36 @@ AsyncSessionLocal = sessionmaker(
 # Create a base for declarative models
 Base = declarative_base()
 
+def get_engine() -> AsyncEngine:
+    """Return the asynchronous engine, creating it (and binding AsyncSessionLocal) on first call."""
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            settings.DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=True, # Survive connections dropped by Postgres/pgbouncer restarts
+        )
+        AsyncSessionLocal.configure(bind=_engine)
+    return _engine
+
+async def dispose_engine() -> None:
+    """Close all pooled connections (app shutdown). A later get_engine() creates a new engine."""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+def __getattr__(name: str):
+    # Backwards compatibility for `from app.db.database import engine`
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Dependency to get a DB session
 async def get_db() -> AsyncSession:
+    get_engine() # Ensure the session maker is bound
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -30,4 +57,4 @@ async def get_db() -> AsyncSession:
             await session.rollback() # Rollback on error
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -5,4 +5,9 @@ from .user_model import User
 from .student_model import Student
 from .content_model import Content
 from .grade_model import Grade
-from .attendance_model import Attendance
\ No newline at end of file
+from .attendance_model import Attendance
+from .rate_limit_model import RateLimitCounter
+from .attendance_year_model import AttendanceYear
+from .revoked_token_model import RevokedToken
+from .teacher_weekly_summary_model import TeacherWeeklySummary
+from .upload_model import Upload
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, func, Date, Enum as SAEnum
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, func, Date, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 from app.db.database import Base # Import Base from the central database module
 
@@ -11,6 +11,10 @@ class AttendanceStatus(enum.Enum):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # A student's records for a day (used by the trigger maintaining attendance_years)
+        Index("ix_attendance_student_id_attendance_date", "student_id", "attendance_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     attendance_date = Column(Date, nullable=False)
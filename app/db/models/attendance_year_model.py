@@ -0,0 +1,43 @@
+from datetime import date
+
+from sqlalchemy import Column, Integer, Date, ForeignKey, LargeBinary, DateTime, func
+from app.db.database import Base # Import Base from the central database module
+from app.db.models.attendance_model import AttendanceStatus
+
+# Academic years start on September 1st (kept in sync with attendance_year_start() in the migration)
+YEAR_START_MONTH = 9
+
+# One byte per day in AttendanceYear.codes; 0 = no attendance recorded that day
+NO_RECORD = 0
+STATUS_CODES = {
+    AttendanceStatus.PRESENT: 1,
+    AttendanceStatus.ABSENT: 2,
+    AttendanceStatus.LATE: 3,
+    AttendanceStatus.EXCUSED: 4,
+}
+
+
+def academic_year_start(day: date) -> date:
+    """First day of the academic year containing `day`."""
+    year = day.year if day.month >= YEAR_START_MONTH else day.year - 1
+    return date(year, YEAR_START_MONTH, 1)
+
+
+class AttendanceYear(Base):
+    """
+    Compact attendance of one student for one academic year: `codes[i]` is the status
+    code (see STATUS_CODES) of the day `year_start + i days`. At most 366 bytes per row,
+    so a class's full year is one small row per student.
+
+    Maintained by a trigger on the `attendance` table (the latest record of a day wins);
+    never written by the application.
+    """
+    __tablename__ = "attendance_years"
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    year_start = Column(Date, primary_key=True)
+    codes = Column(LargeBinary, nullable=False, default=b"")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<AttendanceYear(student_id={self.student_id}, year_start='{self.year_start}', days={len(self.codes or b'')})>"
@@ -1,6 +1,7 @@
 import enum
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, JSON, Enum as SAEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, Index, Computed, Enum as SAEnum
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.db.database import Base # Import Base from the central database module
 
 class ContentType(enum.Enum):
@@ -8,6 +9,18 @@ class ContentType(enum.Enum):
     EXAM = "exam"
     QUIZ = "quiz"
 
+# Text search configuration used for the search vector and for queries against it.
+# 'simple' (no stemming) keeps prefix matching predictable for search-as-you-type.
+SEARCH_CONFIG = "simple"
+
+# Maintained by Postgres as a STORED generated column; title ranks above description,
+# which ranks above the string values extracted from the JSONB payload.
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(jsonb_to_tsvector('{SEARCH_CONFIG}', coalesce(data, '{{}}'::jsonb), '[\"string\"]'), 'C')"
+)
+
 class Content(Base):
     __tablename__ = "content"
 
@@ -17,13 +30,25 @@ class Content(Base):
     description = Column(Text, nullable=True)
     # For exams/quizzes: questions, options, type (multiple choice, short answer etc.)
     # For material: structure, text, links
-    data = Column(JSON, nullable=True)
+    # Payload columns are deferred: plain select(Content) (e.g. list views) never fetches them.
+    # Use undefer(Content.data) / undefer(Content.answer_key) when the body is needed.
+    data = deferred(Column(JSONB, nullable=True))
     # For exams/quizzes: correct answers, scoring logic if complex
-    answer_key = Column(JSON, nullable=True)
+    answer_key = deferred(Column(JSONB, nullable=True))
     teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False) # Link to the teacher who created it
+    # Full-text search document (generated, never written by the app); deferred like the payload
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Teacher library listing: WHERE teacher_id = ? ORDER BY created_at DESC
+        Index("ix_content_teacher_id_created_at", "teacher_id", "created_at"),
+        # Containment queries on the payload, e.g. data @> '{"subject": "Biology"}'
+        Index("ix_content_data_gin", "data", postgresql_using="gin", postgresql_ops={"data": "jsonb_path_ops"}),
+        Index("ix_content_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     # Relationships
     teacher = relationship("User", back_populates="content_items")
     grades = relationship("Grade", back_populates="content", cascade="all, delete-orphan") # Grades for this exam/quiz
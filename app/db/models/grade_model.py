@@ -1,22 +1,31 @@
-from sqlalchemy import Column, Integer, Float, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, Float, Text, ForeignKey, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.db.database import Base # Import Base from the central database module
 
 class Grade(Base):
     __tablename__ = "grades"
+    __table_args__ = (
+        # A student's grades, newest first (dashboard "latest grades" and per-student aggregates)
+        Index("ix_grades_student_id_grading_date", "student_id", "grading_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     score = Column(Float, nullable=False)
     max_score = Column(Float, nullable=True) # Max possible score for this assessment
     feedback = Column(Text, nullable=True) # AI generated or teacher's feedback
+    # Points awarded per question, in the same order as the questions in Content.data.
+    # Used by the analytics service for item analysis; may be NULL for manually entered totals.
+    question_scores = Column(ARRAY(Float), nullable=True)
     grading_date = Column(DateTime(timezone=True), server_default=func.now())
     # Storing OCR text temporarily might be useful for audit/review, but can be large.
     # Consider if this is truly needed in the DB long-term or handled differently.
     # extracted_ocr_text = Column(Text, nullable=True)
 
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
-    content_id = Column(Integer, ForeignKey("content.id"), nullable=False) # The exam/quiz this grade is for
+    content_id = Column(Integer, ForeignKey("content.id"), nullable=False, index=True) # The exam/quiz this grade is for
     created_at = Column(DateTime(timezone=True), server_default=func.now()) # When the grade record was created
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     student = relationship("Student", back_populates="grades")
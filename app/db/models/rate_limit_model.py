@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, BigInteger, Integer
+from app.db.database import Base # Import Base from the central database module
+
+class RateLimitCounter(Base):
+    """
+    Shared fixed-window hit counters for the Postgres rate-limit backend.
+    UNLOGGED: counters are disposable, so skip WAL writes (the table is emptied after a crash).
+    """
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String(255), primary_key=True) # e.g. "login:ip:203.0.113.7"
+    window_start = Column(BigInteger, primary_key=True) # Epoch seconds at which the fixed window starts
+    hits = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RateLimitCounter(key='{self.key}', window_start={self.window_start}, hits={self.hits})>"
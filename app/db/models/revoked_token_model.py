@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, func
+from app.db.database import Base # Import Base from the central database module
+
+class RevokedToken(Base):
+    """
+    JWT ids (`jti`) of access tokens revoked by logout and of password reset tokens
+    that have been used. Rows are purged once the token would have expired anyway.
+    Mirrored in each worker by app.core.revocation.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True) # The token's own `exp`
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True) # Incremental refresh watermark
+
+    def __repr__(self):
+        return f"<RevokedToken(jti='{self.jti}', expires_at='{self.expires_at}')>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, LargeBinary, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
+from app.db.database import Base # Import Base from the central database module
+
+class TeacherWeeklySummary(Base):
+    """
+    Precomputed weekly grade and attendance summary of a teacher's class (Monday to Sunday),
+    written off-peak by the scheduler (app/core/scheduler.py) so Monday morning reads are
+    a primary-key lookup. `payload` is the serialized TeacherWeeklySummary schema and
+    `report_xlsx` the prebuilt spreadsheet report.
+    """
+    __tablename__ = "teacher_weekly_summaries"
+
+    teacher_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    week_start = Column(Date, primary_key=True) # Monday
+    payload = Column(JSONB, nullable=False)
+    report_xlsx = deferred(Column(LargeBinary, nullable=True)) # Only loaded for report downloads
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TeacherWeeklySummary(teacher_id={self.teacher_id}, week_start='{self.week_start}')>"
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, UniqueConstraint, func
+from sqlalchemy.orm import relationship
+from app.db.database import Base # Import Base from the central database module
+
+class Upload(Base):
+    """
+    A file uploaded by a teacher (answer-sheet scan, roster). The bytes live in the
+    content-addressed store (app/core/uploads.py) under `sha256`; identical files are
+    stored once and a teacher uploading the same file again gets the existing row.
+    """
+    __tablename__ = "uploads"
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "sha256", name="uq_uploads_teacher_id_sha256"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    teacher_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(BigInteger, nullable=False) # Bytes, counted against UPLOAD_TEACHER_QUOTA_BYTES
+    mime_type = Column(String(100), nullable=False) # Sniffed from the content, not the client's claim
+    filename = Column(String(255), nullable=True) # As sent by the client
+    purpose = Column(String(50), nullable=True) # e.g. "answer_sheet", "roster"
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    teacher = relationship("User")
+
+    def __repr__(self):
+        return f"<Upload(id={self.id}, teacher_id={self.teacher_id}, sha256='{self.sha256[:12]}', size={self.size})>"
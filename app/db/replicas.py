@@ -0,0 +1,201 @@
+"""
+Read-replica routing.
+
+Read-only endpoints take their session from `get_read_db` instead of `get_db`. It is
+bound to a streaming replica from DATABASE_REPLICA_URLS, or to the primary when:
+  - no replicas are configured,
+  - the request itself writes (POST/PUT/PATCH/DELETE),
+  - the client wrote recently (read-your-writes: after a successful unsafe request
+    the response sets a short-lived cookie that pins the client's reads to the
+    primary for DB_READ_YOUR_WRITES_SECONDS),
+  - every replica is unreachable or lags more than DB_REPLICA_MAX_LAG_SECONDS.
+
+Replica health and lag are measured at most once per DB_REPLICA_CHECK_INTERVAL_SECONDS
+per replica and cached in the worker, so routing adds no query to most requests.
+"""
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncGenerator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, get_engine
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_COOKIE = "db_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Seconds since the last replayed transaction; 0 when the replica has replayed everything
+# it received. NULL (never healthy) when no WAL receiver is running, e.g. after losing the
+# primary, or nothing was replayed yet: received == replayed then says nothing about staleness
+_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE pid IS NOT NULL) "
+    "OR pg_last_xact_replay_timestamp() IS NULL THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# True while handling a request whose reads must see the primary
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+
+@dataclass
+class _Replica:
+    url: str
+    engine: Optional[AsyncEngine] = None
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    checked_at: float = float("-inf")
+
+    def get_engine(self) -> AsyncEngine:
+        if self.engine is None:
+            self.engine = create_async_engine(
+                self.url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                pool_pre_ping=True,
+            )
+        return self.engine
+
+
+_replicas: Optional[List[_Replica]] = None
+_next_replica = 0
+_check_lock: Optional[asyncio.Lock] = None
+
+
+def _configured_replicas() -> List[_Replica]:
+    global _replicas
+    if _replicas is None:
+        urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+        _replicas = [_Replica(url=url) for url in urls]
+    return _replicas
+
+
+def replicas_configured() -> bool:
+    return bool(_configured_replicas())
+
+
+async def _measure_lag(replica: _Replica):
+    async with replica.get_engine().connect() as connection:
+        return await connection.scalar(_LAG_QUERY)
+
+
+async def _check(replica: _Replica) -> None:
+    """Measure a replica's replay lag; any failure marks it unhealthy until the next check."""
+    try:
+        # The timeout covers connecting too: an unreachable replica must not stall the request
+        lag = await asyncio.wait_for(_measure_lag(replica), timeout=settings.DB_REPLICA_CHECK_TIMEOUT_SECONDS)
+        if lag is None:
+            replica.healthy = False
+            replica.lag_seconds = None
+            logger.warning("Replica has no WAL receiver or replayed transaction, reading from the primary")
+        else:
+            replica.lag_seconds = float(lag)
+            replica.healthy = replica.lag_seconds <= settings.DB_REPLICA_MAX_LAG_SECONDS
+            if not replica.healthy:
+                logger.warning("Replica lagging %.1fs behind the primary, reading from the primary", replica.lag_seconds)
+    except Exception as e:
+        replica.healthy = False
+        replica.lag_seconds = None
+        logger.warning("Replica health check failed, reading from the primary: %r", e)
+    replica.checked_at = time.monotonic()
+
+
+async def _refresh_stale(replicas: List[_Replica]) -> None:
+    global _check_lock
+    now = time.monotonic()
+    stale = [r for r in replicas if now - r.checked_at >= settings.DB_REPLICA_CHECK_INTERVAL_SECONDS]
+    if not stale:
+        return
+    if _check_lock is None:
+        _check_lock = asyncio.Lock()
+    if _check_lock.locked():
+        return # Another request is checking; use the cached state meanwhile
+    async with _check_lock:
+        await asyncio.gather(*(_check(replica) for replica in stale))
+
+
+async def get_read_engine() -> AsyncEngine:
+    """Engine for a read-only unit of work: a healthy replica (round robin) or the primary."""
+    global _next_replica
+    replicas = _configured_replicas()
+    if not replicas or _use_primary.get():
+        return get_engine()
+    await _refresh_stale(replicas)
+    healthy = [replica for replica in replicas if replica.healthy]
+    if not healthy:
+        return get_engine()
+    _next_replica = (_next_replica + 1) % len(healthy)
+    return healthy[_next_replica].get_engine()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only routes. Nothing is committed; writing through this
+    session fails on a replica ("cannot execute ... in a read-only transaction").
+    """
+    engine = await get_read_engine()
+    async with AsyncSessionLocal(bind=engine) as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+async def dispose_replica_engines() -> None:
+    for replica in _configured_replicas():
+        if replica.engine is not None:
+            await replica.engine.dispose()
+            replica.engine = None
+        replica.checked_at = float("-inf")
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a request's reads to the primary when it writes or when the client wrote
+    within the last DB_READ_YOUR_WRITES_SECONDS, and sets the pin cookie after
+    successful writes. Does nothing when no replicas are configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not replicas_configured():
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        writes = scope["method"] not in SAFE_METHODS
+        try:
+            pinned_until = float(connection.cookies.get(PRIMARY_PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0.0
+        token = _use_primary.set(writes or pinned_until > time.time())
+
+        async def send_with_pin(message: Message) -> None:
+            if writes and message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_PIN_COOKIE}={time.time() + window:.0f}; Max-Age={window}; Path=/; HttpOnly; SameSite=Lax",
+                )
+                message["headers"] = headers.raw
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _use_primary.reset(token)
@@ -1,17 +1,85 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
+
+from app.core import background
+from app.core.config import settings, get_settings
+from app.core.compression import CompressionMiddleware
+from app.core.http_client import close_http_client
+from app.core.logging_config import RequestIdMiddleware, configure_logging, shutdown_logging
+from app.core.rate_limit import load_limits
+from app.core.revocation import revocation_list
+from app.core.scheduler import Job, WeeklySchedule, scheduler
+from app.core.responses import ORJSONResponse
+from app.db.database import get_engine, dispose_engine
+from app.db.replicas import ReadYourWritesMiddleware, dispose_replica_engines
+from app.services import weekly_summary_service
 
 # Import routers
 from app.api.auth_router import router as auth_router
-# from app.api.content_router import router as content_router # Temporarily disabled
+from app.api.analytics_router import router as analytics_router
+from app.api.attendance_router import router as attendance_router
+from app.api.content_router import router as content_router
+from app.api.dashboard_router import router as dashboard_router
+from app.api.summary_router import router as summary_router
+from app.api.upload_router import router as upload_router
 # from app.api.grading_router import router as grading_router # Temporarily disabled
 # from app.api.report_router import router as report_router # Temporarily disabled
 
+logger = logging.getLogger(__name__)
+
+async def _warm_up() -> None:
+    """Preload per-worker shared state so the first requests don't pay for it."""
+    get_settings()
+    engine = get_engine()
+    if settings.DB_WARM_POOL_ON_STARTUP:
+        try:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as e: # The app can still start; requests will retry the connection
+            logger.warning("Could not open a database connection during startup: %s", e)
+
+def _start_scheduler() -> None:
+    """Register periodic jobs; every worker schedules them, advisory locks pick one runner."""
+    if not settings.SCHEDULER_ENABLED:
+        return
+    scheduler.add_job(Job(
+        name=weekly_summary_service.JOB_NAME,
+        schedule=WeeklySchedule(weekday=settings.WEEKLY_SUMMARY_WEEKDAY, hour=settings.WEEKLY_SUMMARY_HOUR),
+        run=weekly_summary_service.precompute_weekly_summaries,
+    ))
+    scheduler.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process-wide setup happens here rather than as import side effects.
+    # Heavy clients (mail, HTTP, ...) are created lazily on first use.
+    configure_logging()
+    load_limits() # Fail the boot on a malformed RATE_LIMIT_* value
+    await _warm_up()
+    await revocation_list.load() # Before traffic, so revoked tokens are never accepted unchecked
+    _start_scheduler()
+    yield
+    # Graceful shutdown: the server has stopped accepting and drained in-flight requests.
+    # Stop scheduled jobs (an interrupted run is caught up by the next start-up), flush
+    # background work (queued emails), then release outbound clients and DB connections.
+    await scheduler.stop()
+    await background.drain(timeout=settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    await close_http_client()
+    await dispose_replica_engines()
+    await dispose_engine()
+    shutdown_logging() # Last, so the shutdown steps' records are written out
+
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Teacherly AI API",
     description="Backend API for Teacherly AI platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse, # orjson / pydantic-core serialization instead of json.dumps
 )
 
 # Configure CORS
@@ -23,9 +91,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (generated exams/materials) when the client accepts it
+# (thresholds and levels come from settings)
+app.add_middleware(CompressionMiddleware)
+
+# Keep a client's reads on the primary right after it writes (no-op without read replicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Outermost: tag every log record of a request (and the response) with its request id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
-# app.include_router(content_router, prefix="/api/content", tags=["Content"]) # Temporarily disabled
+app.include_router(analytics_router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(attendance_router, prefix="/api/attendance", tags=["Attendance"])
+app.include_router(content_router, prefix="/api/content", tags=["Content"])
+app.include_router(dashboard_router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(summary_router, prefix="/api/summaries", tags=["Summaries"])
+app.include_router(upload_router, prefix="/api/uploads", tags=["Uploads"])
 # app.include_router(grading_router, prefix="/api/grading", tags=["Grading"]) # Temporarily disabled
 # app.include_router(report_router, prefix="/api/report", tags=["Reports"]) # Temporarily disabled
 
@@ -34,5 +117,6 @@ async def root():
     return {"message": "Welcome to Teacherly AI API. Visit /docs for documentation."}
 
 if __name__ == "__main__":
+    # Development server with auto-reload; use `python -m app.server` in production
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,34 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class QuestionStatistics(BaseModel):
+    question_index: int # Zero-based position of the question in Content.data
+    max_points: float
+    responses: int # Number of grades that recorded a score for this question
+    mean_score: Optional[float] = None
+    difficulty_index: Optional[float] = None # Share of available points earned (1.0 = easiest)
+    discrimination_index: Optional[float] = None # Upper 27% minus lower 27%, as a share of max_points
+
+class HistogramBin(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+class StudentScore(BaseModel):
+    student_id: int
+    score: float
+    z_score: float
+    percentile_rank: float # Percentage of the class scoring strictly below this student
+
+class ContentAnalytics(BaseModel):
+    content_id: int
+    student_count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std_dev: Optional[float] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    percentiles: Dict[str, float] = {} # e.g. {"p25": 12.0, "p50": 15.5, ...}
+    histogram: List[HistogramBin] = []
+    questions: List[QuestionStatistics] = []
+    students: List[StudentScore] = []
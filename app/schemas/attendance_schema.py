@@ -0,0 +1,23 @@
+from datetime import date
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class StudentAttendanceSummary(BaseModel):
+    student_id: int
+    full_name: str
+    recorded_days: int # Days in the range with an attendance record
+    present: int
+    absent: int
+    late: int
+    excused: int
+    attendance_rate: Optional[float] = None # (present + late) / recorded days
+    longest_absence_streak: int # Consecutive recorded days absent (unrecorded days don't break it)
+    most_absent_weekday: Optional[str] = None # Weekday with the most absences, if any day has two or more
+
+class ClassAttendanceSummary(BaseModel):
+    start_date: date
+    end_date: date
+    student_count: int
+    attendance_rate: Optional[float] = None # Over all students' recorded days
+    weekday_absence_rates: Dict[str, float] = {} # e.g. {"Monday": 0.08, ...}, weekdays with records only
+    students: List[StudentAttendanceSummary] = []
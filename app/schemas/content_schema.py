@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, field_validator
+from datetime import datetime
+
+from app.db.models.content_model import ContentType
+
+class ContentSummary(BaseModel):
+    """Content without its JSONB payload, for list views."""
+    id: int
+    title: str
+    content_type: ContentType
+    description: Optional[str] = None
+    teacher_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True # Pydantic V2
+
+class ContentRead(ContentSummary):
+    data: Optional[Any] = None
+    answer_key: Optional[Any] = None
+
+class ContentCreate(BaseModel):
+    """A content item written by the teacher."""
+    title: str
+    content_type: ContentType
+    description: Optional[str] = None
+    data: Optional[Any] = None
+    answer_key: Optional[Any] = None
+
+class ContentUpdate(BaseModel):
+    """Fields to change; omitted fields are kept."""
+    title: Optional[str] = None
+    description: Optional[str] = None
+    data: Optional[Any] = None
+    answer_key: Optional[Any] = None
+
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, value: Optional[str]) -> str:
+        # Optional only so it can be omitted; the column is NOT NULL
+        if value is None:
+            raise ValueError("title cannot be null")
+        return value
+
+class ContentSearchResult(ContentSummary):
+    rank: float
+
+class ContentSearchPage(BaseModel):
+    items: List[ContentSearchResult]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page
+
+class ContentGenerationRequest(BaseModel):
+    """What a teacher asks Gemini to generate; also the key for semantic reuse."""
+    content_type: ContentType
+    title: str
+    description: Optional[str] = None
+    parameters: Dict[str, Any] = {} # e.g. {"subject": "Biology", "grade_level": "Grade 9", "topic": "photosynthesis"}
+
+class ContentGenerationResult(BaseModel):
+    content: ContentRead
+    reused: bool # True when an existing item was returned instead of calling Gemini
+
+class SimilarContent(ContentSummary):
+    similarity: float # Cosine similarity of the request and the item (1.0 = identical)
+
+class ContentReuseStats(BaseModel):
+    """Counters of this worker process since it started."""
+    lookups: int
+    reused: int
+    generated: int
+    lookup_errors: int
+    llm_calls_avoided_share: Optional[float] = None # reused / (reused + generated)
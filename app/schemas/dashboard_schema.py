@@ -0,0 +1,29 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.db.models.content_model import ContentType
+
+class RecentGrade(BaseModel):
+    content_id: int
+    title: str
+    content_type: ContentType
+    score: float
+    max_score: Optional[float] = None
+    percentage: Optional[float] = None
+    grading_date: Optional[datetime] = None
+
+class StudentDashboardRow(BaseModel):
+    student_id: int
+    full_name: str
+    graded_count: int = 0
+    average_percentage: Optional[float] = None # Mean of score / max_score over all graded work
+    attendance_rate: Optional[float] = None # (present + late) / recorded days this academic year
+    recent_grades: List[RecentGrade] = []
+
+class TeacherDashboard(BaseModel):
+    academic_year_start: date
+    student_count: int
+    class_average_percentage: Optional[float] = None # Mean of the students' averages
+    class_attendance_rate: Optional[float] = None # Over all recorded days this academic year
+    students: List[StudentDashboardRow] = []
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 
@@ -7,4 +8,6 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
-    user_id: Optional[int] = None # Or subject, depending on what you store
\ No newline at end of file
+    user_id: Optional[int] = None # Or subject, depending on what you store
+    jti: Optional[str] = None # Token id, checked against revocations
+    expires_at: Optional[datetime] = None
\ No newline at end of file
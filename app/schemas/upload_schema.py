@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+class UploadRead(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    purpose: Optional[str] = None
+    mime_type: str # Sniffed from the content
+    size: int
+    sha256: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True # Pydantic V2
+
+class UploadUsage(BaseModel):
+    used_bytes: int
+    quota_bytes: int
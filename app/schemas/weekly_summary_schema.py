@@ -0,0 +1,26 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+class StudentWeeklySummary(BaseModel):
+    student_id: int
+    full_name: str
+    graded_count: int = 0 # Grades with a grading date in the week
+    average_percentage: Optional[float] = None # Mean of score / max_score over those grades
+    recorded_days: int = 0
+    present: int = 0
+    absent: int = 0
+    late: int = 0
+    excused: int = 0
+    attendance_rate: Optional[float] = None # (present + late) / recorded days
+
+class TeacherWeeklySummary(BaseModel):
+    week_start: date # Monday
+    week_end: date # Sunday
+    computed_at: datetime
+    precomputed: bool = False # False when computed for this request
+    student_count: int
+    graded_count: int = 0
+    class_average_percentage: Optional[float] = None # Mean of the students' weekly averages
+    class_attendance_rate: Optional[float] = None # Over all recorded days of the week
+    students: List[StudentWeeklySummary] = []
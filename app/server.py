@@ -0,0 +1,96 @@
+"""
+Production entrypoint.
+
+    python -m app.server
+
+Runs uvicorn with multiple worker processes tuned from settings (see the
+"Production server" section of app/core/config.py). Graceful shutdown: on SIGTERM
+uvicorn stops accepting connections, waits up to SERVER_GRACEFUL_TIMEOUT_SECONDS
+for in-flight requests, then runs the app lifespan shutdown (background task
+drain, HTTP client close, engine dispose).
+"""
+import importlib.util
+import inspect
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _cgroup_cpu_limit() -> Optional[int]:
+    """CPU limit imposed by a container (cgroup v2 cpu.max), if any."""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return max(1, int(int(quota) / int(period)))
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use (affinity mask and container quota)."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY if set, otherwise one async worker per available core."""
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+    return available_cpus()
+
+
+def _fastest_available(preferred: str, fallback: str) -> str:
+    return preferred if importlib.util.find_spec(preferred) is not None else fallback
+
+
+def server_options() -> Dict[str, Any]:
+    """Keyword arguments for uvicorn.run()."""
+    options: Dict[str, Any] = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": worker_count(),
+        "loop": _fastest_available("uvloop", "asyncio"),
+        "http": _fastest_available("httptools", "h11"),
+        "lifespan": "on",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "limit_max_requests": settings.SERVER_MAX_REQUESTS,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+    }
+    # Jittered recycling needs a recent uvicorn; older versions recycle at exactly N requests
+    if "limit_max_requests_jitter" in inspect.signature(uvicorn.Config.__init__).parameters:
+        options["limit_max_requests_jitter"] = settings.SERVER_MAX_REQUESTS_JITTER
+    return options
+
+
+def main() -> None:
+    options = server_options()
+    if options["workers"] > 1 and not settings.CHROMA_HOST:
+        logger.warning(
+            "%d workers without CHROMA_HOST: only one worker can open the embedded ChromaDB store, "
+            "content reuse is skipped in the others", options["workers"],
+        )
+    logger.info(
+        "Starting %d worker(s) on %s:%d (loop=%s, http=%s)",
+        options["workers"], options["host"], options["port"], options["loop"], options["http"],
+    )
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
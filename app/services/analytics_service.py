@@ -0,0 +1,225 @@
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.crud import crud_content, crud_grade
+from app.schemas.analytics_schema import (
+    ContentAnalytics,
+    HistogramBin,
+    QuestionStatistics,
+    StudentScore,
+)
+
+# NumPy is imported inside the functions that use it, keeping it out of app start-up
+if TYPE_CHECKING:
+    import numpy as np
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+DISCRIMINATION_GROUP_SHARE = 0.27 # Classic Kelley split: compare the top and bottom 27% of the class
+
+# content_id -> (grade fingerprint, analytics); least recently used entries are evicted first
+_analytics_cache: "OrderedDict[int, Tuple[Tuple[Any, ...], ContentAnalytics]]" = OrderedDict()
+
+
+def invalidate_content_analytics(content_id: int) -> None:
+    """Drop cached analytics for a content item (call after writing its grades)."""
+    _analytics_cache.pop(content_id, None)
+
+
+def _cache_get(content_id: int, fingerprint: Tuple[Any, ...]) -> Optional[ContentAnalytics]:
+    entry = _analytics_cache.get(content_id)
+    if entry is None or entry[0] != fingerprint:
+        return None
+    _analytics_cache.move_to_end(content_id)
+    return entry[1]
+
+
+def _cache_put(content_id: int, fingerprint: Tuple[Any, ...], analytics: ContentAnalytics) -> None:
+    _analytics_cache[content_id] = (fingerprint, analytics)
+    _analytics_cache.move_to_end(content_id)
+    while len(_analytics_cache) > settings.ANALYTICS_CACHE_SIZE:
+        _analytics_cache.popitem(last=False)
+
+
+def _optional(value: float) -> Optional[float]:
+    """Convert NaN (undefined statistic) to None for the response schema."""
+    return None if math.isnan(value) else float(value)
+
+
+def _column_means(matrix: "np.ndarray") -> "np.ndarray":
+    """Per-column mean ignoring NaN; columns without any value yield NaN (without warnings)."""
+    import numpy as np
+
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=0)
+    totals = np.where(present, matrix, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+def question_max_points(data: Any) -> Optional["np.ndarray"]:
+    """
+    Extract per-question maximum points from Content.data, if the content declares them
+    as {"questions": [{"points": 2, ...}, ...]}. Returns None when points are not available.
+    """
+    import numpy as np
+
+    if not isinstance(data, dict) or not isinstance(data.get("questions"), list):
+        return None
+    points = []
+    for question in data["questions"]:
+        value = question.get("points") if isinstance(question, dict) else None
+        points.append(float(value) if isinstance(value, (int, float)) else np.nan)
+    return np.asarray(points, dtype=np.float64) if points else None
+
+
+def _build_item_matrix(question_scores: Sequence[Optional[Sequence[Optional[float]]]], width: int) -> "np.ndarray":
+    """Pack ragged per-question score lists into a (students x questions) matrix padded with NaN."""
+    import numpy as np
+
+    matrix = np.full((len(question_scores), width), np.nan, dtype=np.float64)
+    for row, scores in enumerate(question_scores):
+        if scores:
+            values = np.asarray(scores, dtype=np.float64)[:width]
+            matrix[row, : values.shape[0]] = values
+    return matrix
+
+
+def compute_analytics(
+    content_id: int,
+    rows: Sequence[Tuple[int, float, Optional[float], Optional[Sequence[Optional[float]]]]],
+    max_points: Optional["np.ndarray"] = None,
+) -> ContentAnalytics:
+    """
+    Compute class statistics and item analysis for one content item.
+
+    Args:
+        content_id: The exam/quiz the rows belong to.
+        rows: (student_id, score, max_score, question_scores) tuples, one per grade.
+        max_points: Optional per-question maximum points; observed maxima are used otherwise.
+
+    Returns:
+        ContentAnalytics with distribution statistics, per-question indices and per-student z-scores.
+    """
+    import numpy as np
+
+    student_count = len(rows)
+    if student_count == 0:
+        return ContentAnalytics(content_id=content_id, student_count=0)
+
+    student_ids, score_values, max_score_values, question_scores = zip(*rows)
+    scores = np.asarray(score_values, dtype=np.float64)
+    max_scores = np.asarray(max_score_values, dtype=np.float64) # None becomes NaN
+
+    # --- Distribution of total scores ---
+    mean = scores.mean()
+    std_dev = scores.std()
+    z_scores = (scores - mean) / std_dev if std_dev > 0 else np.zeros_like(scores)
+    sorted_scores = np.sort(scores)
+    percentile_ranks = np.searchsorted(sorted_scores, scores, side="left") / student_count * 100.0
+    percentile_values = np.percentile(scores, PERCENTILES)
+
+    upper_bound = np.nanmax(max_scores) if not np.isnan(max_scores).all() else 0.0
+    upper_bound = max(float(upper_bound), float(sorted_scores[-1]), 1.0)
+    lower_bound = min(0.0, float(sorted_scores[0]))
+    counts, edges = np.histogram(scores, bins=settings.ANALYTICS_HISTOGRAM_BINS, range=(lower_bound, upper_bound))
+
+    # --- Item analysis ---
+    width = max((len(q) for q in question_scores if q), default=0)
+    if max_points is not None:
+        width = max(width, max_points.shape[0])
+    questions = []
+    if width:
+        matrix = _build_item_matrix(question_scores, width)
+        responses = (~np.isnan(matrix)).sum(axis=0)
+        item_means = _column_means(matrix)
+
+        points = np.full(width, np.nan)
+        if max_points is not None:
+            points[: max_points.shape[0]] = max_points[:width]
+        observed_max = np.where(responses > 0, np.where(np.isnan(matrix), -np.inf, matrix).max(axis=0), np.nan)
+        points = np.where(np.isnan(points), observed_max, points)
+        points = np.where(points > 0, points, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            difficulty = item_means / points
+            # Rank only students with per-question scores, otherwise their NaN rows empty the groups
+            scored_rows = np.flatnonzero(~np.isnan(matrix).all(axis=1))
+            if scored_rows.shape[0] >= 2:
+                group_size = max(1, int(round(scored_rows.shape[0] * DISCRIMINATION_GROUP_SHARE)))
+                order = scored_rows[np.argsort(scores[scored_rows], kind="stable")]
+                discrimination = (
+                    _column_means(matrix[order[-group_size:]]) - _column_means(matrix[order[:group_size]])
+                ) / points
+            else:
+                discrimination = np.full(width, np.nan)
+
+        questions = [
+            QuestionStatistics(
+                question_index=index,
+                max_points=0.0 if np.isnan(points[index]) else float(points[index]),
+                responses=int(responses[index]),
+                mean_score=_optional(item_means[index]),
+                difficulty_index=_optional(difficulty[index]),
+                discrimination_index=_optional(discrimination[index]),
+            )
+            for index in range(width)
+        ]
+
+    return ContentAnalytics(
+        content_id=content_id,
+        student_count=student_count,
+        mean=float(mean),
+        median=float(np.median(scores)),
+        std_dev=float(std_dev),
+        min_score=float(sorted_scores[0]),
+        max_score=float(sorted_scores[-1]),
+        percentiles={f"p{p}": float(v) for p, v in zip(PERCENTILES, percentile_values)},
+        histogram=[
+            HistogramBin(lower=float(edges[i]), upper=float(edges[i + 1]), count=int(counts[i]))
+            for i in range(counts.shape[0])
+        ],
+        questions=questions,
+        students=[
+            StudentScore(
+                student_id=int(student_ids[i]),
+                score=float(scores[i]),
+                z_score=float(z_scores[i]),
+                percentile_rank=float(percentile_ranks[i]),
+            )
+            for i in range(student_count)
+        ],
+    )
+
+
+async def get_content_analytics(db: AsyncSession, content_id: int, teacher_id: int) -> ContentAnalytics:
+    """
+    Return analytics for a teacher's exam/quiz.
+    Results are cached per content and recomputed only when its grade set changes.
+    """
+    content = await crud_content.get_content_by_id(db, content_id=content_id, teacher_id=teacher_id)
+    if not content:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Content not found",
+        )
+
+    fingerprint = await crud_grade.get_grade_fingerprint(db, content_id=content_id)
+    cached = _cache_get(content_id, fingerprint)
+    if cached is not None:
+        return cached
+
+    await db.refresh(content, attribute_names=["data"]) # The payload is only needed on a miss
+    rows = await crud_grade.get_grade_columns(db, content_id=content_id)
+    analytics = compute_analytics(content_id, rows, max_points=question_max_points(content.data))
+    _cache_put(content_id, fingerprint, analytics)
+    logger.debug("Computed analytics for content %s over %d grades", content_id, len(rows))
+    return analytics
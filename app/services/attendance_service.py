@@ -0,0 +1,144 @@
+import logging
+from datetime import date
+from typing import Optional, Sequence, TYPE_CHECKING
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud import crud_attendance
+from app.db.models.attendance_model import AttendanceStatus
+from app.db.models.attendance_year_model import NO_RECORD, STATUS_CODES, academic_year_start
+from app.schemas.attendance_schema import ClassAttendanceSummary, StudentAttendanceSummary
+
+# NumPy is imported inside the functions that use it, keeping it out of app start-up
+if TYPE_CHECKING:
+    import numpy as np
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MIN_WEEKDAY_ABSENCES = 2 # A single absence is not a weekday pattern
+
+PRESENT = STATUS_CODES[AttendanceStatus.PRESENT]
+ABSENT = STATUS_CODES[AttendanceStatus.ABSENT]
+LATE = STATUS_CODES[AttendanceStatus.LATE]
+EXCUSED = STATUS_CODES[AttendanceStatus.EXCUSED]
+
+
+def codes_matrix(codes: Sequence[Optional[bytes]], first_offset: int, days: int) -> "np.ndarray":
+    """
+    Stack per-student code strings into a (students, days) uint8 matrix covering
+    offsets [first_offset, first_offset + days) of the academic year. Days beyond a
+    student's stored codes (nothing recorded yet) are NO_RECORD.
+    """
+    import numpy as np
+
+    window = slice(first_offset, first_offset + days)
+    buffer = b"".join((row or b"")[window].ljust(days, b"\x00") for row in codes)
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(codes), days)
+
+
+def longest_runs(matrix: "np.ndarray", code: int) -> "np.ndarray":
+    """
+    Longest run of `code` per row, where days without a record (weekends, holidays)
+    neither extend nor break a run.
+    """
+    import numpy as np
+
+    if matrix.shape[1] == 0:
+        return np.zeros(matrix.shape[0], dtype=np.int64)
+    hits = matrix == code
+    breaks = (matrix != code) & (matrix != NO_RECORD)
+    running = np.cumsum(hits, axis=1)
+    # Hits counted up to the most recent breaking day; the run length is the difference
+    at_last_break = np.maximum.accumulate(np.where(breaks, running, 0), axis=1)
+    return (running - at_last_break).max(axis=1)
+
+
+def summarize_class_attendance(
+    rows: Sequence, start_date: date, end_date: date
+) -> ClassAttendanceSummary:
+    """
+    Compute attendance statistics for a class from (student_id, full_name, codes) rows
+    in one vectorized pass over the (students x days) code matrix.
+    """
+    import numpy as np
+
+    year_start = academic_year_start(start_date)
+    days = (end_date - start_date).days + 1
+    matrix = codes_matrix([row[2] for row in rows], (start_date - year_start).days, days)
+
+    present = (matrix == PRESENT).sum(axis=1)
+    absent_days = matrix == ABSENT
+    absent = absent_days.sum(axis=1)
+    late = (matrix == LATE).sum(axis=1)
+    excused = (matrix == EXCUSED).sum(axis=1)
+    recorded_days = matrix != NO_RECORD
+    recorded = recorded_days.sum(axis=1)
+    attended = present + late
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = np.where(recorded > 0, attended / recorded, np.nan)
+    streaks = longest_runs(matrix, ABSENT)
+
+    # (students x 7) absences and (7,) recorded days per weekday
+    column_weekdays = (start_date.weekday() + np.arange(days)) % 7
+    weekday_absences = np.stack([absent_days[:, column_weekdays == w].sum(axis=1) for w in range(7)], axis=1)
+    weekday_recorded = np.array([recorded_days[:, column_weekdays == w].sum() for w in range(7)])
+    weekday_class_absences = weekday_absences.sum(axis=0)
+    busiest_weekday = weekday_absences.argmax(axis=1) if len(rows) else np.zeros(0, dtype=np.int64)
+
+    students = [
+        StudentAttendanceSummary(
+            student_id=row[0],
+            full_name=row[1],
+            recorded_days=int(recorded[i]),
+            present=int(present[i]),
+            absent=int(absent[i]),
+            late=int(late[i]),
+            excused=int(excused[i]),
+            attendance_rate=None if np.isnan(rates[i]) else round(float(rates[i]), 4),
+            longest_absence_streak=int(streaks[i]),
+            most_absent_weekday=(
+                WEEKDAYS[busiest_weekday[i]]
+                if weekday_absences[i, busiest_weekday[i]] >= MIN_WEEKDAY_ABSENCES else None
+            ),
+        )
+        for i, row in enumerate(rows)
+    ]
+    total_recorded = int(recorded.sum())
+    return ClassAttendanceSummary(
+        start_date=start_date,
+        end_date=end_date,
+        student_count=len(rows),
+        attendance_rate=round(float(attended.sum()) / total_recorded, 4) if total_recorded else None,
+        weekday_absence_rates={
+            WEEKDAYS[w]: round(float(weekday_class_absences[w]) / int(weekday_recorded[w]), 4)
+            for w in range(7) if weekday_recorded[w]
+        },
+        students=students,
+    )
+
+
+async def get_class_attendance_summary(
+    db: AsyncSession,
+    teacher_id: int,
+    start_date: date,
+    end_date: date,
+    grade_level: Optional[str] = None,
+) -> ClassAttendanceSummary:
+    """
+    Attendance statistics for a teacher's students (optionally one grade level) between
+    two dates of the same academic year. Reads one compact row per student.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+    if academic_year_start(start_date) != academic_year_start(end_date):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date and end_date must be in the same academic year",
+        )
+    rows = await crud_attendance.get_class_attendance_year(
+        db, teacher_id=teacher_id, year_start=academic_year_start(start_date), grade_level=grade_level
+    )
+    return summarize_class_attendance(rows, start_date, end_date)
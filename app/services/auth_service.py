@@ -10,11 +10,13 @@ from app.db.crud import crud_user
 from app.core.security import (
     verify_password,
     create_password_reset_token,
-    verify_password_reset_token,
+    decode_password_reset_token,
     get_password_hash # Needed for reset logic via update_user
 )
-from app.utils.email import send_email_async
+from app.utils.email import queue_email
 from app.core.config import settings
+from app.core.rate_limit import rate_limiter
+from app.core.revocation import revocation_list
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -55,12 +57,20 @@ async def handle_forgot_password(db: AsyncSession, email: str):
     """
     Handles the forgot password request.
     Generates a reset token and sends it via email if the user exists.
+    Requests for an email that was sent a reset link less than
+    PASSWORD_RESET_COALESCE_SECONDS ago are coalesced: they get the same response but
+    no new token or email (and don't extend the window).
     """
+    coalesce_key = f"password-reset:{email.lower()}"
+    if await rate_limiter.marked_within(coalesce_key, settings.PASSWORD_RESET_COALESCE_SECONDS):
+        logger.info("Password reset for %s coalesced with a recent request", email)
+        return {"message": "If an account with that email exists, a password reset link has been sent."}
+
     user = await crud_user.get_user_by_email(db, email=email)
     
     if not user or not user.is_active:
         # Don't reveal if the user exists or not, or if they are inactive
-        logger.info(f"Password reset requested for non-existent or inactive user: {email}")
+        logger.info("Password reset requested for non-existent or inactive user: %s", email)
         # Still return a success message to prevent user enumeration
         return {"message": "If an account with that email exists, a password reset link has been sent."}
         
@@ -83,9 +93,11 @@ async def handle_forgot_password(db: AsyncSession, email: str):
     </html>
     """
     
-    await send_email_async(subject=subject, email_to=user.email, body=body)
+    # Sent in the background: the response does not wait for the SMTP round trip
+    queue_email(subject=subject, email_to=user.email, body=body)
+    await rate_limiter.mark(coalesce_key)
     
-    logger.info(f"Password reset email sent to {email}")
+    logger.info("Password reset email queued for %s", email)
     return {"message": "If an account with that email exists, a password reset link has been sent."}
 
 
@@ -94,12 +106,13 @@ async def handle_reset_password(db: AsyncSession, token: str, new_password: str)
     Handles the password reset using a token.
     Verifies the token, finds the user, and updates the password.
     """
-    email = verify_password_reset_token(token)
-    if not email:
+    token_data = decode_password_reset_token(token)
+    if not token_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired password reset token",
         )
+    email = token_data.email
         
     user = await crud_user.get_user_by_email(db, email=email)
     if not user:
@@ -114,9 +127,17 @@ async def handle_reset_password(db: AsyncSession, token: str, new_password: str)
             detail="User account is inactive",
         )
         
+    # Single use: revoking in the same transaction as the update rejects replays,
+    # including a concurrent one (only one insert of the jti succeeds)
+    if token_data.jti and not await revocation_list.revoke(db, token_data.jti, token_data.expires_at):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired password reset token",
+        )
+
     # Use the update_user crud function which handles hashing
     # Pass password in a dictionary as expected by update_user
     await crud_user.update_user(db=db, user=user, user_in={"password": new_password})
     
-    logger.info(f"Password successfully reset for user {email}")
+    logger.info("Password successfully reset for user %s", email)
     return {"message": "Password has been successfully reset."}
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Semantic reuse of generated content.
+
+Generated items are embedded (content type, parameters, title, description) in the
+GENERATED_CONTENT_COLLECTION ChromaDB collection. Before calling Gemini,
+`generate_or_reuse` looks for a near-duplicate request ("photosynthesis worksheet
+grade 9" vs "grade 9 photosynthesis exercises") above
+CONTENT_REUSE_SIMILARITY_THRESHOLD and returns that item instead; items owned by
+another teacher (CONTENT_REUSE_SCOPE="all") are copied into the requester's library.
+Suggestions (`suggest_similar`) only ever come from the requester's own library.
+
+Code that creates or edits content calls `index_content`; existing rows are indexed
+with `python -m app.services.content_reuse_service` (backfill).
+
+The vector store is an optimisation only: if it is unavailable, content is generated.
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.vector_store import get_collection, run_in_thread
+from app.db.crud import crud_content
+from app.db.database import AsyncSessionLocal, dispose_engine, get_engine
+from app.db.models.content_model import Content, ContentType
+from app.schemas.content_schema import ContentGenerationRequest, ContentReuseStats, SimilarContent
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Generation parameters kept in Content.data and used for matching
+PARAMETER_KEYS = ("subject", "grade_level", "topic")
+
+
+@dataclass
+class _Stats:
+    lookups: int = 0
+    reused: int = 0
+    generated: int = 0
+    lookup_errors: int = 0
+
+
+_stats = _Stats()
+
+
+def _collection():
+    """Blocking on first use per worker (creates the client and embedding function): call it in a thread."""
+    return get_collection(settings.GENERATED_CONTENT_COLLECTION, metadata={"hnsw:space": "cosine"})
+
+
+def _collection_call(method: str, **kwargs):
+    """Resolve the collection and call `method` on it, both in the calling (worker) thread."""
+    return getattr(_collection(), method)(**kwargs)
+
+
+def request_text(
+    content_type: ContentType, title: str, description: Optional[str], parameters: Dict[str, Any]
+) -> str:
+    """Text embedded for a request or a generated item; both sides must use this."""
+    parts = [content_type.value]
+    parts += [f"{key}: {parameters[key]}" for key in sorted(parameters) if parameters[key] not in (None, "")]
+    parts.append(title)
+    if description:
+        parts.append(description)
+    return "\n".join(str(part).strip().lower() for part in parts)
+
+
+def _where(teacher_id: int, content_type: ContentType, own_only: bool = False) -> Dict[str, Any]:
+    conditions: List[Dict[str, Any]] = [{"content_type": content_type.value}]
+    if own_only or settings.CONTENT_REUSE_SCOPE != "all":
+        conditions.append({"teacher_id": teacher_id})
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _parameters(content: Content) -> Dict[str, Any]:
+    data = content.data if isinstance(content.data, dict) else {}
+    return {key: data[key] for key in PARAMETER_KEYS if key in data}
+
+
+def _upsert(entries: List[Tuple[Content, Dict[str, Any]]]) -> None:
+    """(content, parameters) pairs into the collection (blocking: embeds the documents)."""
+    _collection().upsert(
+        ids=[str(content.id) for content, _ in entries],
+        documents=[
+            request_text(content.content_type, content.title, content.description, parameters)
+            for content, parameters in entries
+        ],
+        metadatas=[
+            {"content_id": content.id, "teacher_id": content.teacher_id, "content_type": content.content_type.value}
+            for content, _ in entries
+        ],
+    )
+
+
+async def index_content(content: Content, parameters: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Add or update the embedding of a content item. `parameters` defaults to the
+    PARAMETER_KEYS found in content.data (which must then be loaded).
+    """
+    if parameters is None:
+        parameters = _parameters(content)
+    try:
+        await run_in_thread(_upsert, [(content, parameters)])
+    except Exception as e:
+        logger.warning("Could not index content %s for reuse: %s", content.id, e)
+
+
+async def remove_content(content_id: int) -> None:
+    """Drop an item's embedding (after the content is deleted)."""
+    try:
+        await run_in_thread(_collection_call, "delete", ids=[str(content_id)])
+    except Exception as e:
+        logger.warning("Could not remove content %s from the reuse index: %s", content_id, e)
+
+
+async def find_similar(
+    teacher_id: int, request: ContentGenerationRequest, limit: Optional[int] = None, own_only: bool = False
+) -> List[Tuple[int, float]]:
+    """
+    Nearest generated items for a request, as (content_id, similarity), most similar
+    first: the teacher's own items, or everyone's with CONTENT_REUSE_SCOPE="all" unless
+    `own_only`. Returns [] if the vector store is unavailable.
+    """
+    text = request_text(request.content_type, request.title, request.description, request.parameters)
+    _stats.lookups += 1
+    try:
+        result = await run_in_thread(
+            _collection_call,
+            "query",
+            query_texts=[text],
+            n_results=limit or settings.CONTENT_REUSE_CANDIDATES,
+            where=_where(teacher_id, request.content_type, own_only=own_only),
+            include=["distances"],
+        )
+    except Exception as e:
+        _stats.lookup_errors += 1
+        logger.warning("Content reuse lookup failed, generating instead: %s", e)
+        return []
+    # Cosine space: distance = 1 - cosine similarity
+    return [(int(content_id), 1.0 - distance) for content_id, distance in zip(result["ids"][0], result["distances"][0])]
+
+
+async def suggest_similar(
+    db: AsyncSession, teacher_id: int, request: ContentGenerationRequest, limit: int = 5
+) -> List[SimilarContent]:
+    """
+    The teacher's own items close to a request (any similarity), to offer before
+    generating. Summaries come from one query, without the payload columns.
+    """
+    matches = await find_similar(teacher_id, request, limit=limit, own_only=True)
+    contents = {
+        content.id: content
+        for content in await crud_content.get_content_summaries(
+            db, [content_id for content_id, _ in matches], teacher_id=teacher_id
+        )
+    }
+    suggestions = []
+    for content_id, similarity in matches:
+        content = contents.get(content_id)
+        if content is None:
+            await remove_content(content_id) # Stale entry for deleted content
+            continue
+        suggestions.append(SimilarContent(
+            id=content.id,
+            title=content.title,
+            content_type=content.content_type,
+            description=content.description,
+            teacher_id=content.teacher_id,
+            created_at=content.created_at,
+            updated_at=content.updated_at,
+            similarity=round(similarity, 4),
+        ))
+    return suggestions
+
+
+async def _reuse(db: AsyncSession, teacher_id: int, request: ContentGenerationRequest) -> Optional[Tuple[Content, float]]:
+    for content_id, similarity in await find_similar(teacher_id, request):
+        if similarity < settings.CONTENT_REUSE_SIMILARITY_THRESHOLD:
+            break
+        content = await crud_content.get_content_with_payload(db, content_id)
+        if content is None:
+            await remove_content(content_id)
+            continue
+        if content.teacher_id != teacher_id:
+            # Adapt another teacher's item: a copy under the requested title, owned by the requester
+            content = await crud_content.create_content(
+                db,
+                teacher_id=teacher_id,
+                title=request.title,
+                content_type=content.content_type,
+                description=request.description or content.description,
+                data=content.data,
+                answer_key=content.answer_key,
+            )
+            await index_content(content, parameters=request.parameters)
+        return content, similarity
+    return None
+
+
+async def generate_or_reuse(
+    db: AsyncSession,
+    teacher_id: int,
+    request: ContentGenerationRequest,
+    generate: Callable[[], Awaitable[Content]],
+    allow_reuse: bool = True,
+) -> Tuple[Content, bool]:
+    """
+    Return (content, reused). Wrap every Gemini generation in this: `generate` is only
+    awaited when no stored item is similar enough; newly generated items are indexed.
+    """
+    if allow_reuse and settings.CONTENT_REUSE_ENABLED:
+        match = await _reuse(db, teacher_id, request)
+        if match is not None:
+            content, similarity = match
+            _stats.reused += 1
+            logger.info("Reused content %s for teacher %s (similarity %.3f)", content.id, teacher_id, similarity)
+            return content, True
+    content = await generate()
+    _stats.generated += 1
+    await index_content(content, parameters=request.parameters)
+    return content, False
+
+
+async def backfill_index(batch_size: int = 500) -> int:
+    """
+    Index every existing content item (idempotent: entries are upserted by id).
+    Reads summary columns and the PARAMETER_KEYS of the payload in keyset pages.
+    Returns the number of items indexed.
+    """
+    indexed = 0
+    after_id = 0
+    get_engine() # Ensure the session maker is bound
+    async with AsyncSessionLocal() as db:
+        while True:
+            rows = await crud_content.list_content_for_indexing(
+                db, PARAMETER_KEYS, after_id=after_id, limit=batch_size
+            )
+            if not rows:
+                return indexed
+            await run_in_thread(_upsert, rows)
+            indexed += len(rows)
+            after_id = rows[-1][0].id
+            logger.info("Indexed %d content items for reuse", indexed)
+
+
+def get_reuse_stats() -> ContentReuseStats:
+    decided = _stats.reused + _stats.generated
+    return ContentReuseStats(
+        lookups=_stats.lookups,
+        reused=_stats.reused,
+        generated=_stats.generated,
+        lookup_errors=_stats.lookup_errors,
+        llm_calls_avoided_share=round(_stats.reused / decided, 4) if decided else None,
+    )
+
+
+async def _backfill(batch_size: int) -> int:
+    try:
+        return await backfill_index(batch_size)
+    finally:
+        await dispose_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index existing content in the reuse collection.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    from app.core.logging_config import configure_logging, shutdown_logging
+
+    configure_logging()
+    try:
+        print(f"Indexed {asyncio.run(_backfill(args.batch_size))} content items")
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import base64
+import json
+import re
+import logging
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud import crud_content
+from app.schemas.content_schema import ContentSearchPage, ContentSearchResult
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_TERMS = 8
+# Letters and digits in any script; everything else (including tsquery operators) is a separator
+_TERM_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def build_prefix_tsquery(text: str) -> Optional[str]:
+    """
+    Turn free text into a to_tsquery() expression where every term is a prefix match,
+    so "photo gra" finds "Photosynthesis grade 9". Returns None if there are no terms.
+    """
+    terms = _TERM_PATTERN.findall(text.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def encode_cursor(rank: float, content_id: int) -> str:
+    """Encode the keyset position (rank, id) of the last returned row."""
+    raw = json.dumps([rank, content_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, content_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), int(content_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid search cursor",
+        )
+
+
+async def search_teacher_content(
+    db: AsyncSession, teacher_id: int, text: str, limit: int = 20, cursor: Optional[str] = None
+) -> ContentSearchPage:
+    """
+    Ranked, keyset-paginated full-text search over a teacher's content library.
+    """
+    tsquery = build_prefix_tsquery(text)
+    if tsquery is None:
+        return ContentSearchPage(items=[])
+
+    after = decode_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page exists
+    rows = await crud_content.search_content(
+        db, teacher_id=teacher_id, tsquery=tsquery, limit=limit + 1, after=after
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [
+        ContentSearchResult(
+            id=content.id,
+            title=content.title,
+            content_type=content.content_type,
+            description=content.description,
+            teacher_id=content.teacher_id,
+            created_at=content.created_at,
+            updated_at=content.updated_at,
+            rank=rank,
+        )
+        for content, rank in rows
+    ]
+    next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id) if has_more else None
+    return ContentSearchPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,119 @@
+"""
+Creating, generating and editing content items.
+
+Every write goes through here so the reuse index (app.services.content_reuse_service)
+stays in step with the table: created and edited items are (re)indexed, and Gemini
+generation is wrapped in `generate_or_reuse`.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.crud import crud_content
+from app.db.models.content_model import Content, ContentType
+from app.schemas.content_schema import ContentCreate, ContentGenerationRequest, ContentUpdate
+from app.services import content_reuse_service
+
+# The Gemini SDK is heavy: imported on first generation, never at app start-up
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+_model: Optional["genai.GenerativeModel"] = None
+
+_SHAPES = {
+    ContentType.EXAM: '{"data": {"questions": [{"text": ..., "type": "multiple_choice" | "short_answer", "options": [...], "points": ...}]}, '
+                      '"answer_key": {"<question index>": ...}}',
+    ContentType.QUIZ: '{"data": {"questions": [{"text": ..., "type": "multiple_choice" | "short_answer", "options": [...], "points": ...}]}, '
+                      '"answer_key": {"<question index>": ...}}',
+    ContentType.MATERIAL: '{"data": {"sections": [{"heading": ..., "text": ...}], "links": [...]}, "answer_key": null}',
+}
+
+
+def _prompt(request: ContentGenerationRequest) -> str:
+    parameters = "\n".join(f"- {key}: {value}" for key, value in request.parameters.items())
+    return (
+        f"Create a {request.content_type.value} for a teacher.\n"
+        f"Title: {request.title}\n"
+        f"Description: {request.description or '-'}\n"
+        f"Parameters:\n{parameters or '- none'}\n"
+        f"Answer with JSON only, shaped as {_SHAPES[request.content_type]}."
+    )
+
+
+def get_gemini_model() -> "genai.GenerativeModel":
+    """Return the worker's Gemini model (GEMINI_MODEL, JSON output), creating it on first use."""
+    import google.generativeai as genai
+
+    global _model
+    if _model is None:
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        _model = genai.GenerativeModel(
+            settings.GEMINI_MODEL, generation_config={"response_mime_type": "application/json"}
+        )
+    return _model
+
+
+async def _call_gemini(request: ContentGenerationRequest) -> Dict[str, Any]:
+    """One generation; returns the parsed {"data": ..., "answer_key": ...} object."""
+    if not settings.GEMINI_API_KEY:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Content generation is not configured")
+    try:
+        response = await get_gemini_model().generate_content_async(_prompt(request))
+        generated = orjson.loads(response.text)
+        if not isinstance(generated, dict) or "data" not in generated:
+            raise ValueError("response has no data")
+    except Exception as e:
+        logger.warning("Gemini generation failed: %s", e)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Content generation failed")
+    return generated
+
+
+async def generate_content(
+    db: AsyncSession, teacher_id: int, request: ContentGenerationRequest, allow_reuse: bool = True
+) -> Tuple[Content, bool]:
+    """
+    Return (content, reused): a near-duplicate stored item when there is one, else a
+    new item generated by Gemini. The request parameters are kept in Content.data.
+    """
+    async def generate() -> Content:
+        generated = await _call_gemini(request)
+        data = generated["data"]
+        if isinstance(data, dict):
+            data = {**request.parameters, **data}
+        return await crud_content.create_content(
+            db,
+            teacher_id=teacher_id,
+            title=request.title,
+            content_type=request.content_type,
+            description=request.description,
+            data=data,
+            answer_key=generated.get("answer_key"),
+        )
+
+    return await content_reuse_service.generate_or_reuse(db, teacher_id, request, generate, allow_reuse=allow_reuse)
+
+
+async def create_content(db: AsyncSession, teacher_id: int, content_in: ContentCreate) -> Content:
+    """Create an item written by the teacher and index it for reuse."""
+    content = await crud_content.create_content(db, teacher_id=teacher_id, **content_in.model_dump())
+    await content_reuse_service.index_content(content)
+    return content
+
+
+async def update_content(db: AsyncSession, teacher_id: int, content_id: int, content_in: ContentUpdate) -> Content:
+    """Update the given fields of a teacher's item and re-index it."""
+    content = await crud_content.get_content_by_id(
+        db, content_id=content_id, teacher_id=teacher_id, with_data=True, with_answer_key=True
+    )
+    if not content:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
+    content = await crud_content.update_content(db, content, content_in.model_dump(exclude_unset=True))
+    await content_reuse_service.index_content(content)
+    return content
@@ -0,0 +1,89 @@
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud import crud_attendance, crud_grade
+from app.db.models.attendance_model import AttendanceStatus
+from app.db.models.attendance_year_model import NO_RECORD, STATUS_CODES, academic_year_start
+from app.schemas.dashboard_schema import RecentGrade, StudentDashboardRow, TeacherDashboard
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Queries per dashboard, independent of class size (checked by benchmarks/query_budget.py)
+QUERY_BUDGET = 3
+
+ATTENDED_CODES = (STATUS_CODES[AttendanceStatus.PRESENT], STATUS_CODES[AttendanceStatus.LATE])
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 2)
+
+
+async def get_teacher_dashboard(
+    db: AsyncSession,
+    teacher_id: int,
+    recent_grades: int = 3,
+    grade_level: Optional[str] = None,
+    today: Optional[date] = None,
+) -> TeacherDashboard:
+    """
+    Landing page data for a teacher: per student the latest grades, average score and
+    this academic year's attendance rate. Runs QUERY_BUDGET queries whatever the class
+    size; nothing is lazy-loaded:
+      1. students with their compact attendance codes for the year (one row each),
+      2. the latest `recent_grades` grades per student (window function),
+      3. per-student grade averages (GROUP BY).
+    """
+    year_start = academic_year_start(today or date.today())
+    students = await crud_attendance.get_class_attendance_year(
+        db, teacher_id=teacher_id, year_start=year_start, grade_level=grade_level
+    )
+    latest = await crud_grade.get_latest_grades_for_teacher(
+        db, teacher_id=teacher_id, per_student=recent_grades, grade_level=grade_level
+    )
+    averages = {
+        row[0]: (row[1], row[2])
+        for row in await crud_grade.get_grade_averages_for_teacher(db, teacher_id=teacher_id, grade_level=grade_level)
+    }
+
+    recent_by_student: Dict[int, List[RecentGrade]] = {}
+    for student_id, content_id, title, content_type, score, max_score, percentage, grading_date in latest:
+        recent_by_student.setdefault(student_id, []).append(RecentGrade(
+            content_id=content_id,
+            title=title,
+            content_type=content_type,
+            score=score,
+            max_score=max_score,
+            percentage=_round(percentage),
+            grading_date=grading_date,
+        ))
+
+    rows = []
+    attended_total = recorded_total = 0
+    for student_id, full_name, codes in students:
+        codes = codes or b""
+        recorded = len(codes) - codes.count(NO_RECORD)
+        attended = sum(codes.count(code) for code in ATTENDED_CODES)
+        attended_total += attended
+        recorded_total += recorded
+        graded_count, average = averages.get(student_id, (0, None))
+        rows.append(StudentDashboardRow(
+            student_id=student_id,
+            full_name=full_name,
+            graded_count=graded_count,
+            average_percentage=_round(average),
+            attendance_rate=round(attended / recorded, 4) if recorded else None,
+            recent_grades=recent_by_student.get(student_id, []),
+        ))
+
+    student_averages = [row.average_percentage for row in rows if row.average_percentage is not None]
+    return TeacherDashboard(
+        academic_year_start=year_start,
+        student_count=len(rows),
+        class_average_percentage=_round(sum(student_averages) / len(student_averages)) if student_averages else None,
+        class_attendance_rate=round(attended_total / recorded_total, 4) if recorded_total else None,
+        students=rows,
+    )
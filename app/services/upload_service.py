@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.uploads import PAYLOAD_TOO_LARGE, allowed_mime_types, map_stored_file, receive_upload, store_upload
+from app.db.crud import crud_upload
+from app.db.models.upload_model import Upload
+from app.schemas.upload_schema import UploadUsage
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+PURPOSES = ("answer_sheet", "roster")
+
+
+def _quota_exceeded() -> HTTPException:
+    return HTTPException(
+        status_code=PAYLOAD_TOO_LARGE,
+        detail="Upload quota exceeded",
+    )
+
+
+async def handle_upload(request: Request, db: AsyncSession, teacher_id: int) -> Tuple[Upload, bool]:
+    """
+    Receive the `file` part of a multipart request for a teacher and store it.
+    Returns (upload, created); created is False when the teacher already uploaded the
+    same content, which costs no quota.
+
+    The body is streamed (see app.core.uploads): the per-file cap is the smaller of
+    UPLOAD_MAX_BYTES and the teacher's remaining quota, and no database connection is
+    held while it arrives.
+    """
+    quota = settings.UPLOAD_TEACHER_QUOTA_BYTES
+    remaining = quota - await crud_upload.get_teacher_usage(db, teacher_id)
+    await db.commit() # Return the connection to the pool while the body streams
+    if remaining <= 0:
+        raise _quota_exceeded()
+
+    upload = await receive_upload(request, max_bytes=min(settings.UPLOAD_MAX_BYTES, remaining))
+    try:
+        if upload.mime_type not in allowed_mime_types():
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Unsupported file type",
+            )
+        purpose = upload.fields.get("purpose") or None
+        if purpose is not None and purpose not in PURPOSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"purpose must be one of {', '.join(PURPOSES)}",
+            )
+
+        existing = await crud_upload.get_upload_by_hash(db, teacher_id=teacher_id, sha256=upload.sha256)
+        if existing:
+            return existing, False
+
+        # Stored before taking the lock (content-addressed, so idempotent): no row lock or
+        # connection is held during the disk copy. A file left by a rejected upload is harmless
+        await db.commit()
+        await asyncio.to_thread(store_upload, upload)
+
+        # Quota check and insert under the teacher's row lock, so parallel uploads can't overshoot
+        used = await crud_upload.get_teacher_usage(db, teacher_id, lock=True)
+        if used + upload.size > quota:
+            await db.rollback()
+            raise _quota_exceeded()
+        try:
+            stored = await crud_upload.create_upload(
+                db,
+                teacher_id=teacher_id,
+                sha256=upload.sha256,
+                size=upload.size,
+                mime_type=upload.mime_type,
+                filename=upload.filename,
+                purpose=purpose,
+            )
+        except IntegrityError: # The same file arrived twice concurrently
+            await db.rollback()
+            existing = await crud_upload.get_upload_by_hash(db, teacher_id=teacher_id, sha256=upload.sha256)
+            if existing is None:
+                raise
+            return existing, False
+        logger.info("Stored upload %s for teacher %s (%s, %d bytes)", stored.id, teacher_id, stored.mime_type, stored.size)
+        return stored, True
+    finally:
+        upload.close()
+
+
+async def get_usage(db: AsyncSession, teacher_id: int) -> UploadUsage:
+    return UploadUsage(
+        used_bytes=await crud_upload.get_teacher_usage(db, teacher_id),
+        quota_bytes=settings.UPLOAD_TEACHER_QUOTA_BYTES,
+    )
+
+
+@contextmanager
+def open_upload(upload: Upload) -> Iterator[memoryview]:
+    """
+    Zero-copy read access for downstream stages (OCR, roster import):
+
+        with upload_service.open_upload(upload) as data:
+            text = ocr(data)
+
+    Blocking work on the view belongs in a thread (asyncio.to_thread).
+    """
+    with map_stored_file(upload.sha256) as view:
+        yield view
+
+
+async def get_upload_or_404(db: AsyncSession, upload_id: int, teacher_id: int) -> Upload:
+    upload: Optional[Upload] = await crud_upload.get_upload(db, upload_id=upload_id, teacher_id=teacher_id)
+    if not upload:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    return upload
@@ -0,0 +1,288 @@
+import asyncio
+import io
+import logging
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.crud import crud_attendance, crud_grade, crud_weekly_summary
+from app.db.database import AsyncSessionLocal, get_engine
+from app.db.models.attendance_model import AttendanceStatus
+from app.db.models.attendance_year_model import NO_RECORD, STATUS_CODES, academic_year_start
+from app.schemas.weekly_summary_schema import StudentWeeklySummary, TeacherWeeklySummary
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "weekly_summaries"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+REPORT_COLUMNS = (
+    "Student", "Grades", "Average %", "Recorded days", "Present", "Absent", "Late", "Excused", "Attendance rate",
+)
+
+_STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+
+
+def week_start_of(day: date) -> date:
+    """Monday of the week containing `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+def last_complete_week(today: Optional[date] = None) -> date:
+    """Monday of the most recent week that has ended."""
+    return week_start_of(today or date.today()) - timedelta(days=7)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 2)
+
+
+def _week_codes(codes: Optional[bytes], year_start: date, week_start: date) -> List[int]:
+    """Attendance codes of the week's days that fall in the academic year starting `year_start`."""
+    codes = codes or b""
+    week = []
+    for offset in range(7):
+        day = week_start + timedelta(days=offset)
+        if academic_year_start(day) != year_start:
+            continue
+        index = (day - year_start).days
+        week.append(codes[index] if index < len(codes) else NO_RECORD)
+    return week
+
+
+# Per student: names and the week's attendance codes
+WeekAttendance = Tuple[Dict[int, str], Dict[int, List[int]]]
+
+
+def _week_bounds(week_start: date) -> Tuple[datetime, datetime]:
+    graded_from = datetime.combine(week_start, time.min, tzinfo=timezone.utc)
+    return graded_from, graded_from + timedelta(days=7)
+
+
+async def _load_week_attendance(db: AsyncSession, teacher_id: int, week_start: date) -> WeekAttendance:
+    """One query, two when the week spans the start of an academic year."""
+    week_end = week_start + timedelta(days=6)
+    names: Dict[int, str] = {}
+    week_codes: Dict[int, List[int]] = {}
+    for year_start in sorted({academic_year_start(week_start), academic_year_start(week_end)}):
+        rows = await crud_attendance.get_class_attendance_year(db, teacher_id=teacher_id, year_start=year_start)
+        for student_id, full_name, codes in rows:
+            names[student_id] = full_name
+            week_codes.setdefault(student_id, []).extend(_week_codes(codes, year_start, week_start))
+    return names, week_codes
+
+
+def _status_counts(codes: List[int]) -> Dict[AttendanceStatus, int]:
+    counts = {status: 0 for status in AttendanceStatus}
+    for code in codes:
+        if code != NO_RECORD:
+            counts[_STATUS_BY_CODE[code]] += 1
+    return counts
+
+
+async def compute_weekly_summary(
+    db: AsyncSession, teacher_id: int, week_start: date, attendance: Optional[WeekAttendance] = None
+) -> TeacherWeeklySummary:
+    """
+    Grade and attendance summary of a teacher's class for the week starting `week_start`
+    (a Monday). Attendance comes from the compact attendance_years rows (one query, two
+    when the week spans the start of an academic year; pass `attendance` if already
+    loaded), grades from one GROUP BY query.
+    """
+    week_end = week_start + timedelta(days=6)
+    names, week_codes = attendance or await _load_week_attendance(db, teacher_id, week_start)
+
+    graded_from, graded_before = _week_bounds(week_start)
+    grades = {
+        row[0]: (row[1], row[2])
+        for row in await crud_grade.get_grade_averages_for_teacher(
+            db, teacher_id=teacher_id, graded_from=graded_from, graded_before=graded_before
+        )
+    }
+
+    students = []
+    attended_total = recorded_total = 0
+    for student_id, full_name in names.items():
+        counts = _status_counts(week_codes.get(student_id, []))
+        recorded = sum(counts.values())
+        attended = counts[AttendanceStatus.PRESENT] + counts[AttendanceStatus.LATE]
+        attended_total += attended
+        recorded_total += recorded
+        graded_count, average = grades.get(student_id, (0, None))
+        students.append(StudentWeeklySummary(
+            student_id=student_id,
+            full_name=full_name,
+            graded_count=graded_count,
+            average_percentage=_round(average),
+            recorded_days=recorded,
+            present=counts[AttendanceStatus.PRESENT],
+            absent=counts[AttendanceStatus.ABSENT],
+            late=counts[AttendanceStatus.LATE],
+            excused=counts[AttendanceStatus.EXCUSED],
+            attendance_rate=round(attended / recorded, 4) if recorded else None,
+        ))
+
+    averages = [student.average_percentage for student in students if student.average_percentage is not None]
+    return TeacherWeeklySummary(
+        week_start=week_start,
+        week_end=week_end,
+        computed_at=datetime.now(timezone.utc),
+        student_count=len(students),
+        graded_count=sum(student.graded_count for student in students),
+        class_average_percentage=_round(sum(averages) / len(averages)) if averages else None,
+        class_attendance_rate=round(attended_total / recorded_total, 4) if recorded_total else None,
+        students=students,
+    )
+
+
+def build_report_xlsx(summary: TeacherWeeklySummary) -> bytes:
+    """Spreadsheet of a weekly summary (one row per student, class totals last)."""
+    import xlsxwriter # Imported here, keeping it out of app start-up
+
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+    sheet = workbook.add_worksheet(f"Week {summary.week_start.isoformat()}")
+    bold = workbook.add_format({"bold": True})
+    percent = workbook.add_format({"num_format": "0.0%"})
+
+    sheet.write(0, 0, f"Week {summary.week_start.isoformat()} to {summary.week_end.isoformat()}", bold)
+    sheet.write_row(2, 0, REPORT_COLUMNS, bold)
+    row = 3
+    for student in summary.students:
+        sheet.write_row(row, 0, (
+            student.full_name,
+            student.graded_count,
+            student.average_percentage,
+            student.recorded_days,
+            student.present,
+            student.absent,
+            student.late,
+            student.excused,
+        ))
+        sheet.write(row, 8, student.attendance_rate, percent)
+        row += 1
+    sheet.write(row, 0, "Class", bold)
+    sheet.write(row, 1, summary.graded_count, bold)
+    sheet.write(row, 2, summary.class_average_percentage, bold)
+    sheet.write(row, 8, summary.class_attendance_rate, percent)
+    sheet.set_column(0, 0, 30)
+    sheet.set_column(1, len(REPORT_COLUMNS) - 1, 14)
+    workbook.close()
+    return output.getvalue()
+
+
+def _payload(summary: TeacherWeeklySummary) -> dict:
+    # computed_at lives in its own column; precomputed is set on read
+    return summary.model_dump(mode="json", exclude={"computed_at", "precomputed"})
+
+
+async def precompute_teacher(teacher_id: int, week_start: date) -> None:
+    """Compute and store one teacher's summary and xlsx report for a week."""
+    get_engine() # Ensure the session maker is bound
+    async with AsyncSessionLocal() as db:
+        summary = await compute_weekly_summary(db, teacher_id, week_start)
+        report = await asyncio.to_thread(build_report_xlsx, summary)
+        await crud_weekly_summary.upsert_weekly_summary(
+            db, teacher_id=teacher_id, week_start=week_start, payload=_payload(summary), report_xlsx=report
+        )
+
+
+async def precompute_weekly_summaries(scheduled_for: datetime) -> None:
+    """
+    Scheduler job: precompute the last complete week for every active teacher not yet done
+    in this run. Teachers start at random offsets within WEEKLY_SUMMARY_SPREAD_SECONDS and
+    at most WEEKLY_SUMMARY_CONCURRENCY are computed at once, so the database sees a
+    steady trickle instead of a burst.
+    """
+    week_start = last_complete_week(scheduled_for.date())
+    get_engine() # Ensure the session maker is bound
+    async with AsyncSessionLocal() as db:
+        teacher_ids = await crud_weekly_summary.get_teachers_without_summary(
+            db, week_start=week_start, computed_since=scheduled_for
+        )
+    if not teacher_ids:
+        return
+
+    semaphore = asyncio.Semaphore(settings.WEEKLY_SUMMARY_CONCURRENCY)
+    spread = settings.WEEKLY_SUMMARY_SPREAD_SECONDS
+
+    async def run_one(teacher_id: int) -> bool:
+        await asyncio.sleep(random.uniform(0, spread))
+        async with semaphore:
+            try:
+                await precompute_teacher(teacher_id, week_start)
+            except Exception:
+                logger.exception("Could not precompute the weekly summary of teacher %s", teacher_id)
+                return False
+        return True
+
+    logger.info("Precomputing week %s for %d teachers", week_start.isoformat(), len(teacher_ids))
+    results = await asyncio.gather(*(run_one(teacher_id) for teacher_id in teacher_ids))
+    failed = results.count(False)
+    if failed:
+        logger.warning("Weekly summaries of %d teacher(s) failed; they are computed on demand", failed)
+
+
+async def _is_current(
+    db: AsyncSession, stored: TeacherWeeklySummary, teacher_id: int, attendance: WeekAttendance
+) -> bool:
+    """
+    Whether a stored summary still matches the grades and attendance (grades or attendance
+    are often entered days later, e.g. Friday's on Monday morning). Grades: the week's
+    count and last change; attendance: the students and their per-status day counts,
+    recounted from the codes already loaded.
+    """
+    graded_count, last_changed = await crud_grade.get_grade_changes_for_teacher(
+        db, teacher_id, *_week_bounds(stored.week_start)
+    )
+    if graded_count != stored.graded_count or (last_changed is not None and last_changed > stored.computed_at):
+        return False
+    names, week_codes = attendance
+    if {student.student_id: student.full_name for student in stored.students} != names:
+        return False
+    for student in stored.students:
+        counts = _status_counts(week_codes.get(student.student_id, []))
+        if (student.present, student.absent, student.late, student.excused) != (
+            counts[AttendanceStatus.PRESENT], counts[AttendanceStatus.ABSENT],
+            counts[AttendanceStatus.LATE], counts[AttendanceStatus.EXCUSED],
+        ):
+            return False
+    return True
+
+
+def _stored(row) -> TeacherWeeklySummary:
+    return TeacherWeeklySummary.model_validate({**row.payload, "computed_at": row.computed_at, "precomputed": True})
+
+
+async def get_weekly_summary(
+    db: AsyncSession, teacher_id: int, week_start: date, refresh: bool = False
+) -> TeacherWeeklySummary:
+    """
+    A teacher's summary for the week starting `week_start`: the precomputed row while it
+    still matches the grades and attendance, otherwise computed for this request.
+    """
+    if refresh:
+        return await compute_weekly_summary(db, teacher_id, week_start)
+    attendance = await _load_week_attendance(db, teacher_id, week_start)
+    row = await crud_weekly_summary.get_weekly_summary(db, teacher_id=teacher_id, week_start=week_start)
+    if row is not None:
+        stored = _stored(row)
+        if await _is_current(db, stored, teacher_id, attendance):
+            return stored
+        logger.debug("Weekly summary of teacher %s for %s is stale", teacher_id, week_start.isoformat())
+    return await compute_weekly_summary(db, teacher_id, week_start, attendance=attendance)
+
+
+async def get_weekly_report(db: AsyncSession, teacher_id: int, week_start: date) -> bytes:
+    """The xlsx report for a week: prebuilt by the scheduled job while current, or built now."""
+    attendance = await _load_week_attendance(db, teacher_id, week_start)
+    row = await crud_weekly_summary.get_weekly_summary(
+        db, teacher_id=teacher_id, week_start=week_start, with_report=True
+    )
+    if row is not None and row.report_xlsx is not None and await _is_current(db, _stored(row), teacher_id, attendance):
+        return row.report_xlsx
+    summary = await compute_weekly_summary(db, teacher_id, week_start, attendance=attendance)
+    return await asyncio.to_thread(build_report_xlsx, summary)
@@ -1,28 +1,38 @@
 import logging
-from typing import List, Optional
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
+from functools import lru_cache
+from typing import List, Optional, TYPE_CHECKING
 
 from app.core.config import settings
+from app.core.background import spawn
+
+if TYPE_CHECKING:
+    from fastapi_mail import FastMail
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configuration from settings
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.SMTP_USER,
-    MAIL_PASSWORD=settings.SMTP_PASSWORD,
-    MAIL_FROM=settings.EMAIL_FROM_ADDRESS,
-    MAIL_PORT=settings.SMTP_PORT,
-    MAIL_SERVER=settings.SMTP_HOST,
-    MAIL_FROM_NAME="Teacherly AI",
-    MAIL_STARTTLS=True, # Use STARTTLS
-    MAIL_SSL_TLS=False, # Don't use implicit SSL/TLS if using STARTTLS
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True # Good practice to validate certs
-)
-
-fm = FastMail(conf)
+@lru_cache(maxsize=1)
+def get_mailer() -> "FastMail":
+    """
+    Build the FastMail client on first use.
+    fastapi_mail (and its SMTP/templating dependencies) is imported here rather than at
+    module import, keeping it out of worker start-up.
+    """
+    from fastapi_mail import FastMail, ConnectionConfig
+
+    # Configuration from settings
+    conf = ConnectionConfig(
+        MAIL_USERNAME=settings.SMTP_USER,
+        MAIL_PASSWORD=settings.SMTP_PASSWORD,
+        MAIL_FROM=settings.EMAIL_FROM_ADDRESS,
+        MAIL_PORT=settings.SMTP_PORT,
+        MAIL_SERVER=settings.SMTP_HOST,
+        MAIL_FROM_NAME="Teacherly AI",
+        MAIL_STARTTLS=True, # Use STARTTLS
+        MAIL_SSL_TLS=False, # Don't use implicit SSL/TLS if using STARTTLS
+        USE_CREDENTIALS=True,
+        VALIDATE_CERTS=True # Good practice to validate certs
+    )
+    return FastMail(conf)
 
 async def send_email_async(subject: str, email_to: str, body: str):
     """
@@ -33,6 +43,8 @@ async def send_email_async(subject: str, email_to: str, body: str):
         # In a real app, you might want to raise an error or handle this differently
         return
 
+    from fastapi_mail import MessageSchema
+
     message = MessageSchema(
         subject=subject,
         recipients=[email_to],
@@ -41,13 +53,20 @@ async def send_email_async(subject: str, email_to: str, body: str):
     )
 
     try:
-        await fm.send_message(message)
-        logger.info(f"Email sent successfully to {email_to} with subject '{subject}'")
+        await get_mailer().send_message(message)
+        logger.info("Email sent successfully to %s with subject '%s'", email_to, subject)
     except Exception as e:
-        logger.error(f"Failed to send email to {email_to}: {e}")
+        logger.error("Failed to send email to %s: %s", email_to, e)
         # Depending on the context, you might want to raise an exception here
         # raise HTTPException(status_code=500, detail=f"Failed to send email: {e}")
 
+def queue_email(subject: str, email_to: str, body: str) -> None:
+    """
+    Send an email in the background so the request does not wait on SMTP.
+    Pending sends are flushed (awaited) during graceful shutdown.
+    """
+    spawn(send_email_async(subject=subject, email_to=email_to, body=body), name="send_email")
+
 # Example usage (for testing purposes, can be removed later)
 # if __name__ == "__main__":
 #     import asyncio
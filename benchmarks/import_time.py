@@ -0,0 +1,103 @@
+"""
+Import-time profile of the application entry point.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter, reports the
+slowest modules and fails (exit code 1) when:
+  - the cumulative import time of app.main exceeds the budget, or
+  - a module that must be loaded lazily (mail client, NumPy, ChromaDB, XlsxWriter, ...)
+    is imported as a side effect of importing the app.
+
+Timings vary between machines; the budget is meant for local checks before pushing.
+The forbidden-module check is deterministic.
+
+Usage:
+    python -m benchmarks.import_time [--budget-ms 1000] [--top 15] [--module app.main]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+
+# Modules only needed by specific requests; they must be imported inside the code that uses them
+LAZY_MODULES = (
+    "fastapi_mail",
+    "aiosmtplib",
+    "numpy",
+    "chromadb",
+    "xlsxwriter",
+    "google.generativeai",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_imports(module: str, runs: int = 3) -> Tuple[Dict[str, Tuple[int, int]], float]:
+    """
+    Import `module` in fresh interpreters and return ({module: (self_us, cumulative_us)}, total_ms)
+    for the fastest run.
+    """
+    best: Tuple[Dict[str, Tuple[int, int]], float] = ({}, float("inf"))
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            raise SystemExit(f"Importing {module} failed")
+        timings: Dict[str, Tuple[int, int]] = {}
+        for line in proc.stderr.splitlines():
+            match = _LINE.match(line)
+            if match:
+                timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+        total_ms = timings.get(module, (0, 0))[1] / 1000
+        if total_ms < best[1]:
+            best = (timings, total_ms)
+    return best
+
+
+def find_eager_lazy_modules(timings: Dict[str, Tuple[int, int]]) -> List[str]:
+    return sorted(
+        name for name in timings
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum cumulative import time (env: IMPORT_TIME_BUDGET_MS)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to try; the fastest counts")
+    args = parser.parse_args()
+
+    timings, total_ms = profile_imports(args.module, args.runs)
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: -item[1][0])[: args.top]:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}  {name}")
+
+    failed = False
+    eager = find_eager_lazy_modules(timings)
+    if eager:
+        failed = True
+        print(f"FAIL: imported eagerly (should be lazy): {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failed = True
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Async load test for the API.
+
+Drives the application in-process through httpx's ASGI transport (app + database,
+no network or server overhead), or a running server with --base-url. Each scenario
+runs `--requests` requests from `--concurrency` virtual users, each with its own
+cookie jar, and reports throughput and p50/p95/p99 latency.
+
+Results are written as JSON to benchmarks/results/<git sha>.json so runs can be
+compared between commits:
+
+    python -m benchmarks.seed_data --teachers 2000
+    python -m benchmarks.load_test                                # in-process
+    python -m benchmarks.load_test --base-url http://localhost:8000
+    python -m benchmarks.load_test --compare benchmarks/results/<other sha>.json
+
+In-process runs disable rate limiting (RATE_LIMIT_ENABLED=false) and scheduled jobs
+(SCHEDULER_ENABLED=false); start a server under test with the same settings, or
+register/login will mostly measure 429s.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.seed_data import BENCH_EMAIL_TEMPLATE, BENCH_PASSWORD, TOPICS
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+@dataclass
+class VirtualUser:
+    client: httpx.AsyncClient
+    number: int
+    email: str = ""
+    content_ids: List[int] = field(default_factory=list)
+    exam_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: Callable[[VirtualUser, int], Awaitable[httpx.Response]]
+    needs_login: bool = True
+    needs_content: bool = False
+
+
+async def _root(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/")
+
+
+async def _register(user: VirtualUser, n: int) -> httpx.Response:
+    # Emails match the seed pattern, so `seed_data --reset` removes them too
+    email = BENCH_EMAIL_TEMPLATE.format(f"load-{uuid.uuid4().hex[:12]}")
+    return await user.client.post(
+        "/api/auth/register",
+        json={"email": email, "full_name": "Load Test", "password": BENCH_PASSWORD},
+    )
+
+
+async def _login(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.post("/api/auth/login", data={"username": user.email, "password": BENCH_PASSWORD})
+
+
+async def _users_me(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/api/auth/users/me")
+
+
+async def _content_list(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/api/content/", params={"limit": 50})
+
+
+async def _content_filtered(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/api/content/", params={"content_type": "exam", "min_questions": 20})
+
+
+async def _content_search(user: VirtualUser, n: int) -> httpx.Response:
+    # Search-as-you-type: a prefix of a seeded topic
+    topic = TOPICS[n % len(TOPICS)]
+    return await user.client.get("/api/content/search", params={"q": topic[: 3 + n % 5]})
+
+
+async def _content_similar(user: VirtualUser, n: int) -> httpx.Response:
+    # Reuse suggestions before generating (needs the index: python -m app.services.content_reuse_service)
+    topic = TOPICS[n % len(TOPICS)]
+    return await user.client.post(
+        "/api/content/similar",
+        json={"content_type": "quiz", "title": f"{topic} quiz", "parameters": {"topic": topic}},
+    )
+
+
+async def _content_detail(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get(f"/api/content/{user.content_ids[n % len(user.content_ids)]}")
+
+
+async def _analytics(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get(f"/api/analytics/content/{user.exam_ids[n % len(user.exam_ids)]}")
+
+
+async def _attendance_summary(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/api/attendance/summary", params={"end_date": "2026-06-30"})
+
+
+async def _dashboard(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/api/dashboard/")
+
+
+async def _weekly_summary(user: VirtualUser, n: int) -> httpx.Response:
+    return await user.client.get("/api/summaries/weekly", params={"week_of": "2025-11-03"})
+
+
+# Add new routes here as they come back online (grading, reports, ...)
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("root", _root, needs_login=False),
+        Scenario("register", _register, needs_login=False),
+        Scenario("login", _login, needs_login=False),
+        Scenario("users_me", _users_me),
+        Scenario("content_list", _content_list),
+        Scenario("content_filtered", _content_filtered),
+        Scenario("content_search", _content_search),
+        Scenario("content_similar", _content_similar),
+        Scenario("content_detail", _content_detail, needs_content=True),
+        Scenario("analytics", _analytics, needs_content=True),
+        Scenario("attendance_summary", _attendance_summary),
+        Scenario("dashboard", _dashboard),
+        Scenario("weekly_summary", _weekly_summary),
+    ]
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_ms: List[float], statuses: Dict[int, int], elapsed: float) -> Dict[str, Any]:
+    latencies_ms = sorted(latencies_ms)
+    errors = sum(count for code, count in statuses.items() if code >= 400 or code == 0)
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 2) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(latencies_ms[-1], 2) if latencies_ms else 0.0,
+    }
+
+
+async def prepare_user(user: VirtualUser, scenario: Scenario, teachers: int) -> None:
+    # Spread virtual users over the seeded teachers, the same ones on every run
+    user.email = BENCH_EMAIL_TEMPLATE.format(user.number * 97 % teachers)
+    if scenario.needs_login:
+        response = await _login(user, 0)
+        response.raise_for_status()
+    if scenario.needs_content:
+        response = await user.client.get("/api/content/", params={"limit": 1000})
+        response.raise_for_status()
+        items = response.json()
+        user.content_ids = [item["id"] for item in items]
+        user.exam_ids = [item["id"] for item in items if item["content_type"] != "material"]
+        if not user.exam_ids:
+            raise SystemExit(f"{user.email} has no exams; seed the database first (python -m benchmarks.seed_data)")
+
+
+async def run_scenario(make_client: Callable[[], httpx.AsyncClient], scenario: Scenario, args: argparse.Namespace) -> Dict[str, Any]:
+    async with AsyncExitStack() as stack:
+        users = []
+        for number in range(args.concurrency):
+            client = await stack.enter_async_context(make_client())
+            user = VirtualUser(client=client, number=number)
+            await prepare_user(user, scenario, args.teachers)
+            users.append(user)
+
+        counter = itertools.count()
+        latencies_ms: List[float] = []
+        statuses: Dict[int, int] = {}
+
+        async def worker(user: VirtualUser, total: int, record: bool) -> None:
+            while (n := next(counter)) < total:
+                started = time.perf_counter()
+                try:
+                    response = await scenario.request(user, n)
+                    code = response.status_code
+                except httpx.HTTPError:
+                    code = 0 # Transport error (connection refused, timeout, ...)
+                if record:
+                    latencies_ms.append((time.perf_counter() - started) * 1000)
+                    statuses[code] = statuses.get(code, 0) + 1
+
+        if args.warmup:
+            await asyncio.gather(*(worker(user, args.warmup, record=False) for user in users))
+            counter = itertools.count()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(user, args.requests, record=True) for user in users))
+        return summarize(latencies_ms, statuses, time.perf_counter() - started)
+
+
+def git_revision() -> str:
+    def git(*command: str) -> str:
+        return subprocess.run(["git", *command], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    sha = git("rev-parse", "--short", "HEAD") or "unknown"
+    return f"{sha}-dirty" if git("status", "--porcelain", "--untracked-files=no") else sha
+
+
+def print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    header = f"{'scenario':<18} {'reqs':>6} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f"  {'vs ' + baseline['meta']['revision']:>24}"
+    print(header)
+    for name, stats in results["scenarios"].items():
+        line = (
+            f"{name:<18} {stats['requests']:>6} {stats['errors']:>5} {stats['throughput_rps']:>9.1f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous and previous["p95_ms"] and previous["throughput_rps"]:
+            p95_change = (stats["p95_ms"] / previous["p95_ms"] - 1) * 100
+            rps_change = (stats["throughput_rps"] / previous["throughput_rps"] - 1) * 100
+            line += f"  p95 {p95_change:>+6.1f}%  req/s {rps_change:>+6.1f}%"
+        print(line)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    selected = [SCENARIOS[name] for name in args.scenarios]
+    timeout = httpx.Timeout(args.timeout)
+    logging.getLogger("httpx").setLevel(logging.WARNING) # One INFO line per request would skew the timings
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            base_url = args.base_url
+            transport_factory = lambda: httpx.AsyncHTTPTransport()
+        else:
+            os.environ.setdefault("RATE_LIMIT_ENABLED", "false") # Settings load lazily, so this still applies
+            os.environ.setdefault("SCHEDULER_ENABLED", "false")
+            from app.main import app
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            base_url = "http://testserver"
+            transport = httpx.ASGITransport(app=app)
+            transport_factory = lambda: transport
+
+        def make_client() -> httpx.AsyncClient:
+            return httpx.AsyncClient(transport=transport_factory(), base_url=base_url, timeout=timeout)
+
+        scenarios: Dict[str, Any] = {}
+        for scenario in selected:
+            print(f"Running {scenario.name} ({args.requests} requests, concurrency {args.concurrency})...", flush=True)
+            scenarios[scenario.name] = await run_scenario(make_client, scenario, args)
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": args.base_url or "in-process",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the app in-process")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users per scenario")
+    parser.add_argument("--teachers", type=int, default=2000, help="Seeded teachers to log in as")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<git sha>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    results = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / f"{results['meta']['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print_report(results, baseline)
+    print(f"Results written to {output.relative_to(ROOT) if output.is_relative_to(ROOT) else output}")
+    return 1 if any(stats["errors"] for stats in results["scenarios"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Cost of a log call on the calling thread (the event loop, in the app).
+
+Compares, per call:
+  - blocking: StreamHandler formatting and writing in the caller (the old setup), to
+              os.devnull and to a slow sink (a stdout pipe the collector reads late)
+  - queued:   the app pipeline (app/core/logging_config.py): filters and enqueue in the
+              caller, JSON formatting and writing on the listener thread; measured with
+              the listener paused (the pure caller cost) and running (GIL contention)
+              to the same slow sink
+  - disabled: a DEBUG call with lazy %-arguments vs an f-string, logger at INFO
+  - capped:   one template beyond its LOG_RATE_LIMITS cap (dropped by the filter)
+
+Fails (exit 1) when the queued call's caller cost exceeds the budget.
+
+Usage:
+    python -m benchmarks.logging_overhead [--calls 20000] [--budget-us 20] [--sink-delay-us 20]
+"""
+import argparse
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueListener
+from typing import Callable, Tuple
+
+from app.core.logging_config import JsonFormatter, NonBlockingQueueHandler, RateLimitFilter, RequestIdFilter, request_id_var
+
+MESSAGE = "Graded content %s for teacher %s"
+
+
+class SlowSink:
+    """A stream whose writes take `delay` seconds, like a pipe with a busy reader."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _per_call_us(calls: int, log: Callable[[int], None]) -> float:
+    started = time.perf_counter()
+    for n in range(calls):
+        log(n)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def blocking(calls: int, stream) -> float:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger = _logger("blocking", handler)
+    return _per_call_us(calls, lambda n: logger.info(MESSAGE, 1234, n))
+
+
+def queued(calls: int, stream, listener_running: bool) -> Tuple[float, float]:
+    """(per-call cost in the caller in us, listener us per record to write everything)"""
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(log_queue, max_size=calls + 1)
+    handler.addFilter(RateLimitFilter({"benchmark.queued": calls + 1}))
+    handler.addFilter(RequestIdFilter())
+    logger = _logger("queued", handler)
+    listener = QueueListener(log_queue, output)
+    if listener_running:
+        listener.start()
+    token = request_id_var.set("0123456789abcdef")
+    try:
+        per_call = _per_call_us(calls, lambda n: logger.info(MESSAGE, 1234, n))
+    finally:
+        request_id_var.reset(token)
+    started = time.perf_counter()
+    if not listener_running:
+        listener.start()
+    listener.stop() # Drains the queue
+    return per_call, (time.perf_counter() - started) / calls * 1e6
+
+
+def disabled(calls: int) -> Tuple[float, float]:
+    logger = _logger("disabled", logging.NullHandler())
+    items = list(range(100))
+    lazy = _per_call_us(calls, lambda n: logger.debug("Items %s", items))
+    eager = _per_call_us(calls, lambda n: logger.debug(f"Items {items}"))
+    return lazy, eager
+
+
+def capped(calls: int, rate_limit: int) -> float:
+    handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=calls + 1)
+    handler.addFilter(RateLimitFilter({"benchmark.capped": rate_limit}))
+    logger = _logger("capped", handler)
+    return _per_call_us(calls, lambda n: logger.info("Cache miss for content %s", n))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--budget-us", type=float, default=20.0, help="Maximum queued cost per call in the caller")
+    parser.add_argument("--sink-delay-us", type=float, default=20.0, help="Time per write of the slow sink")
+    parser.add_argument("--rate-limit", type=int, default=50, help="LOG_RATE_LIMITS cap for the capped case")
+    args = parser.parse_args()
+
+    slow = SlowSink(args.sink_delay_us / 1e6)
+    with open(os.devnull, "w") as devnull:
+        blocking_us = blocking(args.calls, devnull)
+    blocking_slow_us = blocking(args.calls, slow)
+    queued_us, listener_us = queued(args.calls, slow, listener_running=False)
+    contended_us, _ = queued(args.calls, slow, listener_running=True)
+    lazy_us, eager_us = disabled(args.calls)
+    capped_us = capped(args.calls, args.rate_limit)
+
+    print(f"blocking, devnull:                       {blocking_us:7.2f} us/call")
+    print(f"blocking, slow sink ({args.sink_delay_us:g} us/write):       {blocking_slow_us:7.2f} us/call")
+    print(f"queued, caller only:                     {queued_us:7.2f} us/call")
+    print(f"queued, listener running (slow sink):    {contended_us:7.2f} us/call "
+          f"(listener {listener_us:.2f} us/record off the caller)")
+    print(f"disabled DEBUG, lazy %s arguments:       {lazy_us:7.2f} us/call")
+    print(f"disabled DEBUG, f-string:                {eager_us:7.2f} us/call")
+    print(f"over the rate cap (dropped):             {capped_us:7.2f} us/call")
+    within = queued_us <= args.budget_us
+    print(f"{'OK' if within else 'FAIL'}: queued call {queued_us:.2f} us in the caller (budget {args.budget_us:g} us)")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
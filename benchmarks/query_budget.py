@@ -0,0 +1,117 @@
+"""
+Query-count budget for endpoints that aggregate over a whole class.
+
+Creates a throwaway teacher with classes of different sizes inside a transaction
+that is rolled back, counts the SQL statements issued by each checked function and
+fails (exit code 1) when the count grows with class size or exceeds the budget.
+Needs a migrated Postgres at DATABASE_URL (or --database-url).
+
+Usage:
+    python -m benchmarks.query_budget [--sizes 5 60]
+"""
+import argparse
+import asyncio
+import random
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.models.attendance_model import Attendance, AttendanceStatus
+from app.db.models.content_model import Content, ContentType
+from app.db.models.grade_model import Grade
+from app.db.models.student_model import Student
+from app.db.models.user_model import User, UserRole
+from app.services import dashboard_service
+
+Check = Callable[[AsyncSession, int], Awaitable[object]]
+
+# name -> (coroutine under test, maximum number of statements)
+CHECKS: Dict[str, Tuple[Check, int]] = {
+    "dashboard_service.get_teacher_dashboard": (
+        lambda db, teacher_id: dashboard_service.get_teacher_dashboard(db, teacher_id, today=date(2025, 11, 1)),
+        dashboard_service.QUERY_BUDGET,
+    ),
+}
+
+
+@contextmanager
+def count_statements(connection: AsyncConnection) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection.sync_connection, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", record)
+
+
+async def create_class(connection: AsyncConnection, size: int, rng: random.Random) -> int:
+    teacher_id = (await connection.execute(
+        insert(User).returning(User.id),
+        {"email": f"query-budget-{size}@example.com", "hashed_password": "x", "role": UserRole.TEACHER, "is_active": True},
+    )).scalar_one()
+    student_ids = (await connection.execute(
+        insert(Student).returning(Student.id),
+        [{"full_name": f"Student {n}", "teacher_id": teacher_id} for n in range(size)],
+    )).scalars().all()
+    content_ids = (await connection.execute(
+        insert(Content).returning(Content.id),
+        [{"title": f"Exam {n}", "content_type": ContentType.EXAM, "teacher_id": teacher_id, "data": {}} for n in range(4)],
+    )).scalars().all()
+    await connection.execute(insert(Grade), [
+        {"score": rng.randint(0, 20), "max_score": 20.0, "student_id": student_id, "content_id": content_id}
+        for student_id in student_ids for content_id in content_ids
+    ])
+    days = [date(2025, 9, 1) + timedelta(days=n) for n in range(30)]
+    await connection.execute(insert(Attendance), [
+        {"attendance_date": day, "status": rng.choice(list(AttendanceStatus)), "student_id": student_id}
+        for student_id in student_ids for day in days
+    ])
+    return teacher_id
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_async_engine(args.database_url or settings.DATABASE_URL)
+    rng = random.Random(7)
+    failed = False
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            teachers = {size: await create_class(connection, size, rng) for size in args.sizes}
+            for name, (check, budget) in CHECKS.items():
+                counts = {}
+                for size, teacher_id in teachers.items():
+                    # A fresh session per run, so nothing is served from the identity map
+                    async with AsyncSession(bind=connection, join_transaction_mode="rollback_only") as db:
+                        with count_statements(connection) as statements:
+                            await check(db, teacher_id)
+                    counts[size] = len(statements)
+                constant = len(set(counts.values())) == 1
+                within = max(counts.values()) <= budget
+                status = "OK" if constant and within else "FAIL"
+                failed = failed or status == "FAIL"
+                sizes = ", ".join(f"{size} students: {count}" for size, count in counts.items())
+                print(f"{status:<4} {name}: {sizes} (budget {budget})")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from settings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 60], help="Class sizes to compare")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
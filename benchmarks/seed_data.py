@@ -0,0 +1,226 @@
+"""
+Seed a local Postgres with realistic benchmark data.
+
+Creates N teachers (all with the same password), each with a class of students,
+exams/quizzes/materials with generated questions, graded results with per-question
+scores, and daily attendance for a number of school days.
+
+All benchmark teachers use emails "bench-teacher-<n>@example.com" so the data can be
+removed again with --reset without touching real accounts.
+
+Usage:
+    python -m benchmarks.seed_data --teachers 2000 --students 30 --exams 8 --days 90
+    python -m benchmarks.seed_data --reset            # delete benchmark data only
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.models.attendance_model import Attendance, AttendanceStatus
+from app.db.models.content_model import Content, ContentType
+from app.db.models.grade_model import Grade
+from app.db.models.student_model import Student
+from app.db.models.user_model import User, UserRole
+
+BENCH_EMAIL_TEMPLATE = "bench-teacher-{}@example.com"
+BENCH_EMAIL_PATTERN = "bench-teacher-%@example.com"
+BENCH_PASSWORD = "bench-password-1"
+CHUNK_SIZE = 5000
+
+SUBJECTS = ["Biology", "Chemistry", "Physics", "Mathematics", "English", "Amharic", "Geography", "History"]
+GRADE_LEVELS = [f"Grade {n}" for n in range(5, 13)]
+TOPICS = ["photosynthesis", "cell division", "fractions", "algebra", "ecosystems", "acids and bases",
+          "motion", "electricity", "grammar", "reading comprehension", "map reading", "the Axumite kingdom"]
+STATUS_WEIGHTS = [
+    (AttendanceStatus.PRESENT, 0.88),
+    (AttendanceStatus.ABSENT, 0.06),
+    (AttendanceStatus.LATE, 0.04),
+    (AttendanceStatus.EXCUSED, 0.02),
+]
+
+
+def school_days(start: date, count: int) -> List[date]:
+    """`count` weekdays starting at `start`."""
+    days = []
+    current = start
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def make_questions(rng: random.Random, subject: str, topic: str, count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "type": rng.choice(["multiple_choice", "short_answer", "true_false"]),
+            "prompt": f"{subject} question {i + 1} about {topic}: explain or choose the correct statement.",
+            "options": [f"Statement {c} about {topic}" for c in "ABCD"],
+            "points": rng.choice([1, 1, 2, 2, 3, 5]),
+        }
+        for i in range(count)
+    ]
+
+
+async def insert_chunked(connection: AsyncConnection, table, rows: Iterable[Dict[str, Any]]) -> int:
+    """executemany in chunks (asyncpg batches these efficiently); returns rows inserted."""
+    total = 0
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            await connection.execute(insert(table), chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        await connection.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+async def reset(connection: AsyncConnection) -> None:
+    teacher_ids = select(User.id).where(User.email.like(BENCH_EMAIL_PATTERN))
+    student_ids = select(Student.id).where(Student.teacher_id.in_(teacher_ids))
+    content_ids = select(Content.id).where(Content.teacher_id.in_(teacher_ids))
+    await connection.execute(delete(Attendance).where(Attendance.student_id.in_(student_ids)))
+    await connection.execute(delete(Grade).where(Grade.content_id.in_(content_ids)))
+    await connection.execute(delete(Grade).where(Grade.student_id.in_(student_ids)))
+    await connection.execute(delete(Content).where(Content.teacher_id.in_(teacher_ids)))
+    await connection.execute(delete(Student).where(Student.teacher_id.in_(teacher_ids)))
+    await connection.execute(delete(User).where(User.email.like(BENCH_EMAIL_PATTERN)))
+
+
+async def seed(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(args.database_url or settings.DATABASE_URL)
+    started = time.perf_counter()
+    async with engine.begin() as connection:
+        await reset(connection)
+        if args.reset:
+            print("Removed benchmark data")
+            return
+
+        hashed_password = get_password_hash(BENCH_PASSWORD) # bcrypt once, shared by every teacher
+        teacher_rows = [
+            {
+                "email": BENCH_EMAIL_TEMPLATE.format(n),
+                "hashed_password": hashed_password,
+                "full_name": f"Bench Teacher {n}",
+                "role": UserRole.TEACHER,
+                "is_active": True,
+            }
+            for n in range(args.teachers)
+        ]
+        teacher_ids = list((await connection.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True), teacher_rows
+        )).scalars())
+
+        student_rows = [
+            {
+                "full_name": f"Student {t}-{s}",
+                "grade_level": GRADE_LEVELS[t % len(GRADE_LEVELS)],
+                "parent_email": f"parent-{t}-{s}@example.com",
+                "teacher_id": teacher_id,
+            }
+            for t, teacher_id in enumerate(teacher_ids)
+            for s in range(args.students)
+        ]
+        student_ids = list((await connection.execute(
+            insert(Student).returning(Student.id, Student.teacher_id, sort_by_parameter_order=True), student_rows
+        )).all())
+        students_by_teacher: Dict[int, List[int]] = {}
+        for student_id, teacher_id in student_ids:
+            students_by_teacher.setdefault(teacher_id, []).append(student_id)
+
+        content_rows = []
+        for t, teacher_id in enumerate(teacher_ids):
+            subject = SUBJECTS[t % len(SUBJECTS)]
+            for e in range(args.exams):
+                topic = rng.choice(TOPICS)
+                content_type = ContentType.MATERIAL if e % 4 == 3 else (ContentType.QUIZ if e % 2 else ContentType.EXAM)
+                questions = [] if content_type == ContentType.MATERIAL else make_questions(rng, subject, topic, rng.randint(10, args.max_questions))
+                content_rows.append({
+                    "title": f"{GRADE_LEVELS[t % len(GRADE_LEVELS)]} {subject}: {topic} {content_type.value} {e + 1}",
+                    "content_type": content_type,
+                    "description": f"Generated {content_type.value} on {topic} for {subject}.",
+                    "data": {
+                        "subject": subject,
+                        "grade_level": GRADE_LEVELS[t % len(GRADE_LEVELS)],
+                        "topic": topic,
+                        "questions": questions,
+                        "sections": [{"heading": f"Section {i + 1}", "text": f"Notes on {topic}. " * 20} for i in range(3)],
+                    },
+                    "answer_key": {"answers": [{"id": q["id"], "answer": "A"} for q in questions]},
+                    "teacher_id": teacher_id,
+                })
+        content_results = (await connection.execute(
+            insert(Content).returning(
+                Content.id, Content.teacher_id, Content.content_type, Content.data, sort_by_parameter_order=True
+            ),
+            content_rows,
+        )).all()
+
+        def grade_rows():
+            for content_id, teacher_id, content_type, data in content_results:
+                if content_type == ContentType.MATERIAL:
+                    continue
+                points = [q["points"] for q in data["questions"]]
+                max_score = float(sum(points))
+                for student_id in students_by_teacher.get(teacher_id, []):
+                    ability = rng.betavariate(5, 2)
+                    scores = [float(p) if rng.random() < ability else float(rng.randint(0, p - 1) if p > 1 else 0) for p in points]
+                    yield {
+                        "score": sum(scores),
+                        "max_score": max_score,
+                        "question_scores": scores,
+                        "feedback": None,
+                        "student_id": student_id,
+                        "content_id": content_id,
+                    }
+
+        grade_count = await insert_chunked(connection, Grade.__table__, grade_rows())
+
+        days = school_days(date.fromisoformat(args.start_date), args.days)
+        statuses = [status for status, _ in STATUS_WEIGHTS]
+        weights = [weight for _, weight in STATUS_WEIGHTS]
+
+        def attendance_rows():
+            for student_id, _ in student_ids:
+                for day, status in zip(days, rng.choices(statuses, weights, k=len(days))):
+                    yield {"attendance_date": day, "status": status, "student_id": student_id}
+
+        attendance_count = await insert_chunked(connection, Attendance.__table__, attendance_rows())
+
+    await engine.dispose()
+    print(
+        f"Seeded {len(teacher_ids)} teachers, {len(student_ids)} students, {len(content_results)} content items, "
+        f"{grade_count} grades and {attendance_count} attendance rows in {time.perf_counter() - started:.1f}s"
+    )
+    print(f"Teacher logins: {BENCH_EMAIL_TEMPLATE.format('<n>')} / {BENCH_PASSWORD}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from settings")
+    parser.add_argument("--teachers", type=int, default=2000)
+    parser.add_argument("--students", type=int, default=30, help="Students per teacher")
+    parser.add_argument("--exams", type=int, default=8, help="Content items per teacher")
+    parser.add_argument("--max-questions", type=int, default=40)
+    parser.add_argument("--days", type=int, default=90, help="School days of attendance per student")
+    parser.add_argument("--start-date", default="2025-09-08")
+    parser.add_argument("--seed", type=int, default=2025, help="Random seed (same seed, same data)")
+    parser.add_argument("--reset", action="store_true", help="Only delete existing benchmark data")
+    asyncio.run(seed(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
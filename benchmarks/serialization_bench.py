@@ -0,0 +1,130 @@
+"""
+Micro-benchmark of response serialization cost per request.
+
+Compares, for a small payload (UserRead) and a large generated exam (ContentRead):
+  - the previous path: jsonable_encoder + json.dumps (FastAPI's JSONResponse)
+  - model_dump + orjson (what ORJSONResponse does for response_model dicts)
+  - pydantic-core direct to bytes (ORJSONResponse(model) / schema_response)
+and the cost/size of gzip and brotli compression of the resulting body.
+
+Usage:
+    python -m benchmarks.serialization_bench [--questions 1500] [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import orjson
+import pydantic_core
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.models.content_model import ContentType
+from app.db.models.user_model import UserRole
+from app.schemas.content_schema import ContentRead
+from app.schemas.user_schema import UserRead
+
+try:
+    import brotli
+except ImportError: # pragma: no cover
+    brotli = None
+
+
+def make_user() -> UserRead:
+    return UserRead(
+        id=42,
+        email="teacher@example.com",
+        full_name="Abebe Kebede",
+        role=UserRole.TEACHER,
+        is_active=True,
+        created_at=datetime(2025, 5, 12, 8, 30, tzinfo=timezone.utc),
+    )
+
+
+def make_exam(question_count: int) -> ContentRead:
+    """A generated exam shaped like what the AI service stores in Content.data."""
+    questions = [
+        {
+            "id": i,
+            "type": "multiple_choice" if i % 3 else "short_answer",
+            "prompt": f"Question {i}: Explain the role of chlorophyll in photosynthesis in plant cells, "
+                      f"and describe how light intensity affects the rate of reaction {i}.",
+            "options": [f"Option {c} for question {i}" for c in "ABCD"],
+            "points": 1 + i % 4,
+        }
+        for i in range(question_count)
+    ]
+    return ContentRead(
+        id=7,
+        title="Grade 9 Biology: Photosynthesis end-of-unit exam",
+        content_type=ContentType.EXAM,
+        description="Generated from the Ethiopian MOE Grade 9 Biology curriculum, unit 3.",
+        teacher_id=42,
+        created_at=datetime(2025, 5, 12, 8, 30, tzinfo=timezone.utc),
+        data={"subject": "Biology", "grade_level": "Grade 9", "questions": questions},
+        answer_key={"answers": [{"id": q["id"], "answer": "A", "points": q["points"]} for q in questions]},
+    )
+
+
+def strategies(model) -> Dict[str, Callable[[], bytes]]:
+    return {
+        "jsonable_encoder + json.dumps": lambda: json.dumps(
+            jsonable_encoder(model), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "model_dump + orjson": lambda: orjson.dumps(model.model_dump(mode="json")),
+        "pydantic-core to_json": lambda: pydantic_core.to_json(model),
+    }
+
+
+def per_call_us(func: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(question_count: int, repeat: int) -> List[Dict[str, object]]:
+    results = []
+    for name, model in (("UserRead", make_user()), (f"ContentRead ({question_count} questions)", make_exam(question_count))):
+        for strategy, func in strategies(model).items():
+            body = func()
+            results.append({"payload": name, "step": strategy, "us_per_call": per_call_us(func, repeat), "bytes": len(body)})
+
+        body = pydantic_core.to_json(model)
+        if len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+            results.append({
+                "payload": name,
+                "step": f"gzip level {settings.GZIP_COMPRESSION_LEVEL}",
+                "us_per_call": per_call_us(lambda: gzip.compress(body, compresslevel=settings.GZIP_COMPRESSION_LEVEL), repeat),
+                "bytes": len(gzip.compress(body, compresslevel=settings.GZIP_COMPRESSION_LEVEL)),
+            })
+            if brotli is not None:
+                results.append({
+                    "payload": name,
+                    "step": f"brotli quality {settings.BROTLI_QUALITY}",
+                    "us_per_call": per_call_us(lambda: brotli.compress(body, quality=settings.BROTLI_QUALITY), repeat),
+                    "bytes": len(brotli.compress(body, quality=settings.BROTLI_QUALITY)),
+                })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=1500, help="Questions in the large exam payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.questions, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'payload':<32} {'step':<32} {'us/call':>12} {'bytes':>10}")
+    for row in results:
+        print(f"{row['payload']:<32} {row['step']:<32} {row['us_per_call']:>12.1f} {row['bytes']:>10}")
+
+
+if __name__ == "__main__":
+    main()